@@ -1,6 +1,9 @@
 import argparse
+import functools
 import hashlib
 import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pprint import pprint
 from urllib import parse
 from uuid import UUID
@@ -17,254 +20,325 @@ def getvalue(obj, key, default=None):
     return value or default
 
 
+def _dict_getvalue(obj, key, default=None):
+    # getvalue() for plain dicts, which is what generate() is fed with outside of the ORM
+    return obj.get(key, default) or default
+
+
+def _getvalue_for(obj):
+    return _dict_getvalue if isinstance(obj, dict) else getvalue
+
+
+try:
+    hashlib.md5(usedforsecurity=False)
+except TypeError:  # usedforsecurity was added in Python 3.9
+    _md5 = hashlib.md5
+else:
+    # The checksum only detects changes, so skip the FIPS security checks on MD5
+    _md5 = functools.partial(hashlib.md5, usedforsecurity=False)
+
+
+_NATURALLY_ORDERED_TYPES = frozenset((int, float, str, bool))
+_STR_TYPE = frozenset((str,))
+
+
+def _generic_sort_key(item):
+    if isinstance(item, (int, float, str, bool)):
+        return item
+    return str(item)
+
+
+class _Token(str):
+    """ Literal output of the serializer, kept apart from string values still waiting to be encoded """
+
+
+_LIST_END = _Token(']')
+_LIST_SEPARATOR = _Token(',')
+_DICT_END = _Token('}')
+_DICT_SEPARATOR = _Token(',')
+
+
+def _dumps_value(value):
+    # json.dumps(value) built directly for plain ASCII strings, ints and the json constants
+    value_type = type(value)
+    if value_type is str:
+        if value.isascii() and value.isprintable() and '"' not in value and '\\' not in value:
+            return f'"{value}"'
+    elif value_type is int:
+        return repr(value)
+    elif value is True:
+        return 'true'
+    elif value is False:
+        return 'false'
+    elif value is None:
+        return 'null'
+    return json.dumps(value)
+
+
+def _dumps_keys(keys):
+    # json.dumps(keys) built directly for the usual plain ASCII field names, anything needing escapes goes to json
+    if keys and _STR_TYPE.issuperset(map(type, keys)):
+        joined = '", "'.join(keys)
+        if joined.isascii() and joined.isprintable() and '\\' not in joined and joined.count('"') == 2 * len(keys) - 2:
+            return f'["{joined}"]'
+    return json.dumps(keys)
+
+
+# value types a serialized dict can be cached by, float is left out as -0.0 == 0.0 but both serialize differently
+_CACHEABLE_TYPES = frozenset((int, str, bool))
+
+
+def _serialized_cache_key(obj):
+    # flat dicts (e.g. cleaned names and descriptions) repeat a lot in a batch, types are part of the key as
+    # True == 1 but each serializes differently
+    if _CACHEABLE_TYPES.issuperset(map(type, obj.values())) and _CACHEABLE_TYPES.issuperset(map(type, obj)):
+        return tuple((key, type(key), value, type(value)) for key, value in obj.items())
+    return None
+
+
 class Checksum:
+    __slots__ = ('resource', 'checksum_type', 'data', 'verbosity', '_serialized_cache')
+
+    # resource alias -> name of the method extracting the fields used for its checksum
+    _FIELDS_GETTERS = {
+        **dict.fromkeys(('conceptname', 'conceptnames'), 'get_concept_name_fields'),
+        **dict.fromkeys(('conceptdescription', 'conceptdescriptions'), 'get_concept_description_fields'),
+        **dict.fromkeys(('concept', 'concepts', 'concept_version', 'concept_versions'), 'get_concept_fields'),
+        **dict.fromkeys(('mapping', 'mappings', 'mapping_version', 'mapping_versions'), 'get_mapping_fields'),
+        **dict.fromkeys(('organization', 'org', 'orgs', 'organizations'), 'get_organization_fields'),
+        **dict.fromkeys(('user', 'userprofile', 'users', 'userprofiles'), 'get_user_fields'),
+        **dict.fromkeys(('source', 'sources', 'source_version', 'source_versions'), 'get_source_fields'),
+        **dict.fromkeys(
+            ('collection', 'collections', 'collection_version', 'collection_versions'), 'get_collection_fields'),
+    }
+    _VALID_RESOURCES = frozenset(_FIELDS_GETTERS)
+    # fields left out of the checksum when empty
+    _DROP_IF_FALSY = frozenset((
+        'retired', 'parent_concept_urls', 'child_concept_urls', 'descriptions', 'extras', 'names',
+        'locale_preferred', 'name_type', 'description_type'
+    ))
+    _LOCALE_KEYS = frozenset(('names', 'descriptions'))
+    _CONCEPT_NAME_FIELDS = ('locale', 'locale_preferred', 'name', 'name_type', 'external_id')
+    _CONCEPT_DESCRIPTION_FIELDS = ('locale', 'locale_preferred', 'description', 'description_type', 'external_id')
+    # resource -> checksum type -> (field, key in the data, default) for the resources whose fields are read as is
+    _FIELD_TEMPLATES = {
+        'organization': {
+            'standard': (
+                ('name', 'name', None), ('company', 'company', None), ('location', 'location', None),
+                ('website', 'website', None), ('extras', 'extras', None),
+            ),
+            'smart': (
+                ('name', 'name', None), ('company', 'company', None), ('location', 'location', None),
+                ('website', 'website', None), ('is_active', 'is_active', True),
+            ),
+        },
+        'user': {
+            'standard': (
+                ('first_name', 'first_name', None), ('last_name', 'last_name', None), ('username', 'username', None),
+                ('company', 'company', None), ('location', 'location', None), ('website', 'website', None),
+                ('preferred_locale', 'preferred_locale', None), ('extras', 'extras', None),
+            ),
+            'smart': (
+                ('first_name', 'first_name', None), ('last_name', 'last_name', None), ('username', 'username', None),
+                ('company', 'company', None), ('location', 'location', None), ('is_active', 'is_active', True),
+            ),
+        },
+        'collection': {
+            'standard': (
+                ('collection_type', 'collection_type', None), ('canonical_url', 'canonical_url', None),
+                ('custom_validation_schema', 'custom_validation_schema', None),
+                ('default_locale', 'default_locale', None), ('supported_locales', 'supported_locales', None),
+                ('website', 'website', None), ('extras', 'extras', None),
+            ),
+            'smart': (
+                ('collection_type', 'collection_type', None), ('canonical_url', 'canonical_url', None),
+                ('custom_validation_schema', 'custom_validation_schema', None),
+                ('default_locale', 'default_locale', None), ('released', 'released', False),
+                ('retired', 'retired', False),
+            ),
+        },
+        'source': {
+            'standard': (
+                ('source_type', 'collection_type', None), ('canonical_url', 'canonical_url', None),
+                ('custom_validation_schema', 'custom_validation_schema', None),
+                ('default_locale', 'default_locale', None), ('hierarchy_meaning', 'hierarchy_meaning', None),
+                ('supported_locales', 'supported_locales', None), ('website', 'website', None),
+                ('extras', 'extras', None),
+            ),
+            'smart': (
+                ('source_type', 'collection_type', None), ('canonical_url', 'canonical_url', None),
+                ('custom_validation_schema', 'custom_validation_schema', None),
+                ('default_locale', 'default_locale', None), ('released', 'released', False),
+                ('retired', 'retired', False),
+            ),
+        },
+    }
+
     def __init__(self, resource, data, checksum_type='standard', verbosity=0):
-        self.resource = resource
+        # interned so the extractor lookup compares by identity, the case is kept as dispatch is case-sensitive
+        self.resource = sys.intern(resource) if type(resource) is str else resource
         self.checksum_type = checksum_type
         self.data = self.flatten([data])
         self.verbosity = verbosity
-        if self.resource and self.resource.lower() not in [
-            'conceptname', 'conceptnames', 'conceptdescription', 'conceptdescriptions',
-            'concept', 'concepts', 'concept_version', 'concept_versions',
-            'mapping', 'mappings', 'mapping_version', 'mapping_versions',
-            'organization', 'org', 'orgs', 'organizations',
-            'user', 'userprofile', 'users', 'userprofiles',
-            'source', 'sources', 'source_version', 'source_versions',
-            'collection', 'collections', 'collection_version', 'collection_versions'
-        ]:
+        self._serialized_cache = {}
+        if self.resource and self.resource.lower() not in self._VALID_RESOURCES:
             raise ValueError(f"Invalid resource: {self.resource}")
         if self.checksum_type not in ['standard', 'smart']:
             raise ValueError(f"Invalid checksum type: {self.checksum_type}")
 
+    @classmethod
+    def generate_batch(cls, resource, data_list, checksum_type='standard', max_workers=None, chunksize=100):
+        # checksum of each resource in data_list (in the same order), spread over worker processes
+        cls(resource, [], checksum_type)  # validates the arguments before any worker is started
+        generate = functools.partial(_generate_checksum, cls, resource, checksum_type=checksum_type)
+        if max_workers == 1:
+            return [generate(data) for data in data_list]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(generate, data_list, chunksize=chunksize))
+
     def generate(self):
+        self._serialized_cache = {}
         data = self._get_data_by_resource()
 
         if self.verbosity:
             print("\n")
-            print("Fields for Checksum:")
+            print("Fields for Checksum (after cleanup):")
             pprint(data)
 
-            print("\n")
-            print("After Cleanup:")
-            pprint([self._cleanup(_data) for _data in data])
-
-        checksums = [
-            self._generate(self._cleanup(_data)) for _data in data
-        ] if isinstance(data, list) else [self._generate(self._cleanup(data))]
+        checksums = [self._generate(_data) for _data in data]
         if len(checksums) == 1:
             return checksums[0]
         return self._generate(checksums)
 
     def _get_data_by_resource(self):
-        if self.resource in ['conceptname', 'conceptnames']:
-            return [self.get_concept_name_fields(_data) for _data in self.data]
-        if self.resource in ['conceptdescription', 'conceptdescriptions']:
-            return [self.get_concept_description_fields(_data) for _data in self.data]
-        if self.resource in ['concept', 'concepts', 'concept_version', 'concept_versions']:
-            return [self.get_concept_fields(_data) for _data in self.data]
-        if self.resource in ['mapping', 'mappings', 'mapping_version', 'mapping_versions']:
-            return [self.get_mapping_fields(_data) for _data in self.data]
-        if self.resource in ['organization', 'org', 'orgs', 'organizations']:
-            return [self.get_organization_fields(_data) for _data in self.data]
-        if self.resource in ['user', 'userprofile', 'users', 'userprofiles']:
-            return [self.get_user_fields(_data) for _data in self.data]
-        if self.resource in ['source', 'sources', 'source_version', 'source_versions']:
-            return [self.get_source_fields(_data) for _data in self.data]
-        if self.resource in ['collection', 'collections', 'collection_version', 'collection_versions']:
-            return [self.get_collection_fields(_data) for _data in self.data]
-
-        return self.data
+        fields_getter = self._FIELDS_GETTERS.get(self.resource)
+        if fields_getter:
+            fields_getter = getattr(self, fields_getter)
+            return [fields_getter(_data) for _data in self.data]
+
+        return [self._cleanup(_data) for _data in self.data]
 
     @staticmethod
     def get_concept_name_fields(data):
-        fields = ['locale', 'locale_preferred', 'name', 'name_type', 'external_id']
-        return {field: getvalue(data, field, None) for field in fields}
+        get = _getvalue_for(data)
+        return Checksum._clean_fields((field, get(data, field, None)) for field in Checksum._CONCEPT_NAME_FIELDS)
 
     @staticmethod
     def get_concept_description_fields(data):
-        fields = ['locale', 'locale_preferred', 'description', 'description_type', 'external_id']
-        return {field: getvalue(data, field, None) for field in fields}
+        get = _getvalue_for(data)
+        return Checksum._clean_fields(
+            (field, get(data, field, None)) for field in Checksum._CONCEPT_DESCRIPTION_FIELDS)
 
     def get_concept_fields(self, data):
-        fields = {
-            'concept_class': getvalue(data, 'concept_class', None),
-            'datatype': getvalue(data, 'datatype', None),
-            'retired': getvalue(data, 'retired', False),
-        }
+        get = _getvalue_for(data)
+        fields = [
+            ('concept_class', get(data, 'concept_class', None)),
+            ('datatype', get(data, 'datatype', None)),
+            ('retired', get(data, 'retired', False)),
+        ]
         if self.checksum_type == 'standard':
-            return {
-                **fields,
-                'external_id': getvalue(data, 'external_id', None),
-                'extras': getvalue(data, 'extras', None),
-                'names': self._locales_for_checksums(
-                    data,
-                    'names',
-                    lambda _: True
-                ),
-                'descriptions': self._locales_for_checksums(
-                    data,
-                    'descriptions',
-                    lambda _: True
-                ),
-                'parent_concept_urls': getvalue(data, 'parent_concept_urls', []),
-                'child_concept_urls': getvalue(data, 'child_concept_urls', []),
-            }
-        return {
-                **fields,
-                'names': self._locales_for_checksums(
-                    data,
-                    'names',
-                    lambda locale: self.is_fully_specified_type(getvalue(locale, 'name_type', None))
-                ),
-            }
+            fields += [
+                ('external_id', get(data, 'external_id', None)),
+                ('extras', get(data, 'extras', None)),
+                ('names', self._locales_for_checksums(data, 'names')),
+                ('descriptions', self._locales_for_checksums(data, 'descriptions')),
+                ('parent_concept_urls', get(data, 'parent_concept_urls', [])),
+                ('child_concept_urls', get(data, 'child_concept_urls', [])),
+            ]
+        else:
+            fields.append(
+                ('names', self._locales_for_checksums(data, 'names', self._is_fully_specified_name))
+            )
+        return self._clean_fields(fields)
 
     @staticmethod
     def decode_string(string, plus=True):
+        if isinstance(string, str) and '%' not in string and not (plus and '+' in string):
+            return string  # nothing to decode, most concept codes are plain
         return parse.unquote_plus(string) if plus else parse.unquote(string)
 
     def get_mapping_fields(self, data):
-        to_concept_code = getvalue(data, 'to_concept_code', None)
-        to_concept_url = getvalue(data, 'to_concept_url', None)
-        to_source_url = getvalue(data, 'to_source_url', None)
-        to_source_version = getvalue(data, 'to_source_version', None)
-        from_concept_code = getvalue(data, 'from_concept_code', None)
-        from_concept_url = getvalue(data, 'from_concept_url', None)
-        from_source_url = getvalue(data, 'from_source_url', None)
-        from_source_version = getvalue(data, 'from_source_version', None)
-
-        def expand_concept_url(concept_url, concept_code, source_url, source_version):
-            if concept_url and (not concept_code or not source_url):
-                url_parts = concept_url.split('/concepts/')  # /orgs/{org}/sources/{source}(/concepts/){concept}/
-                if not concept_code:
-                    concept_code = url_parts[1].split('/')[0]
-                if not source_url:
-                    source_url = url_parts[0] + '/'
-                    if source_url.count('/') == 6:  # /orgs/{org}/sources/{source}/{source_version}/
-                        source_version = source_url.split('/')[-1]
-                        source_url = '/'.join(source_url.split('/')[:-1])
-            if concept_code:
-                concept_code = self.decode_string(concept_code)
-            return concept_code, source_url, source_version
-        to_concept_code, to_source_url, to_source_version = expand_concept_url(
+        get = _getvalue_for(data)
+        to_concept_code = get(data, 'to_concept_code', None)
+        to_concept_url = get(data, 'to_concept_url', None)
+        to_source_url = get(data, 'to_source_url', None)
+        to_source_version = get(data, 'to_source_version', None)
+        from_concept_code = get(data, 'from_concept_code', None)
+        from_concept_url = get(data, 'from_concept_url', None)
+        from_source_url = get(data, 'from_source_url', None)
+        from_source_version = get(data, 'from_source_version', None)
+
+        to_concept_code, to_source_url, to_source_version = self._expand_concept_url(
             to_concept_url, to_concept_code, to_source_url, to_source_version)
-        from_concept_code, from_source_url, from_source_version = expand_concept_url(
+        from_concept_code, from_source_url, from_source_version = self._expand_concept_url(
             from_concept_url, from_concept_code, from_source_url, from_source_version)
 
-        fields = {
-                'map_type': getvalue(data, 'map_type', None),
-                'from_concept_code': from_concept_code,
-                'to_concept_code': to_concept_code,
-                'from_concept_name': getvalue(data, 'from_concept_name', None),
-                'to_concept_name': getvalue(data, 'to_concept_name', None),
-                'retired': getvalue(data, 'retired', False)
-            }
+        fields = [
+            ('map_type', get(data, 'map_type', None)),
+            ('from_concept_code', from_concept_code),
+            ('to_concept_code', to_concept_code),
+            ('from_concept_name', get(data, 'from_concept_name', None)),
+            ('to_concept_name', get(data, 'to_concept_name', None)),
+            ('retired', get(data, 'retired', False)),
+        ]
 
         if self.checksum_type == 'standard':
-            return {
-                **fields,
-                'sort_weight': float(getvalue(data, 'sort_weight', 0)) or None,
-                'from_source_url': from_source_url,
-                'from_source_version': from_source_version,
-                'to_source_url': to_source_url,
-                'to_source_version': to_source_version,
-                **{
-                    field: getvalue(data, field, None) or None for field in [
-                        'extras',
-                        'external_id',
-                    ]
-                }
-            }
-        return fields
+            fields += [
+                ('sort_weight', float(get(data, 'sort_weight', 0)) or None),
+                ('from_source_url', from_source_url),
+                ('from_source_version', from_source_version),
+                ('to_source_url', to_source_url),
+                ('to_source_version', to_source_version),
+                ('extras', get(data, 'extras', None)),
+                ('external_id', get(data, 'external_id', None)),
+            ]
+        return self._clean_fields(fields)
+
+    @staticmethod
+    def _expand_concept_url(concept_url, concept_code, source_url, source_version):
+        if concept_url and (not concept_code or not source_url):
+            url_parts = concept_url.split('/concepts/')  # /orgs/{org}/sources/{source}(/concepts/){concept}/
+            if not concept_code:
+                concept_code = url_parts[1].partition('/')[0]
+            if not source_url:
+                source_url = url_parts[0]
+                if source_url.count('/') == 5:  # /orgs/{org}/sources/{source}/{source_version}
+                    # matches the checksums already stored by the OCL API, which keep the version in the source url
+                    source_version = ''
+                else:
+                    source_url += '/'
+        if concept_code:
+            concept_code = Checksum.decode_string(concept_code)
+        return concept_code, source_url, source_version
 
     def get_organization_fields(self, data):
-        fields = {
-            'name': getvalue(data, 'name', None),
-            'company': getvalue(data, 'company', None),
-            'location': getvalue(data, 'location', None),
-            'website': getvalue(data, 'website', None),
-        }
-        if self.checksum_type == 'standard':
-            return {
-                **fields,
-                'extras': getvalue(data, 'extras', None),
-            }
-        return {
-            **fields,
-            'is_active': getvalue(data, 'is_active', True)
-        }
+        return self._get_template_fields(data, self._FIELD_TEMPLATES['organization'][self.checksum_type])
 
     def get_user_fields(self, data):
-        fields = {
-            'first_name': getvalue(data, 'first_name', None),
-            'last_name': getvalue(data, 'last_name', None),
-            'username': getvalue(data, 'username', None),
-            'company': getvalue(data, 'company', None),
-            'location': getvalue(data, 'location', None),
-        }
-        if self.checksum_type == 'standard':
-            return {
-                **fields,
-                'website': getvalue(data, 'website', None),
-                'preferred_locale': getvalue(data, 'preferred_locale', None),
-                'extras': getvalue(data, 'extras', None)
-            }
-        return {
-            **fields,
-            'is_active': getvalue(data, 'is_active', True)
-        }
+        return self._get_template_fields(data, self._FIELD_TEMPLATES['user'][self.checksum_type])
 
     def get_collection_fields(self, data):
-        fields = {
-            'collection_type': getvalue(data, 'collection_type', None),
-            'canonical_url': getvalue(data, 'canonical_url', None),
-            'custom_validation_schema': getvalue(data, 'custom_validation_schema', None),
-            'default_locale': getvalue(data, 'default_locale', None),
-        }
-        if self.checksum_type == 'standard':
-            return {
-                **fields,
-                'supported_locales': getvalue(data, 'supported_locales', None),
-                'website': getvalue(data, 'website', None),
-                'extras': getvalue(data, 'extras', None),
-            }
-
-        return {
-            **fields,
-            'released': getvalue(data, 'released', False),
-            'retired': getvalue(data, 'retired', False),
-        }
+        return self._get_template_fields(data, self._FIELD_TEMPLATES['collection'][self.checksum_type])
 
     def get_source_fields(self, data):
-        fields = {
-            'source_type': getvalue(data, 'collection_type', None),
-            'canonical_url': getvalue(data, 'canonical_url', None),
-            'custom_validation_schema': getvalue(data, 'custom_validation_schema', None),
-            'default_locale': getvalue(data, 'default_locale', None),
-        }
-        if self.checksum_type == 'standard':
-            return {
-                **fields,
-                'hierarchy_meaning': getvalue(data, 'hierarchy_meaning', None),
-                'supported_locales': getvalue(data, 'supported_locales', None),
-                'website': getvalue(data, 'website', None),
-                'extras': getvalue(data, 'extras', None),
-            }
-
-        return {
-            **fields,
-            'released': getvalue(data, 'released', False),
-            'retired': getvalue(data, 'retired', False),
-        }
+        return self._get_template_fields(data, self._FIELD_TEMPLATES['source'][self.checksum_type])
+
+    @staticmethod
+    def _get_template_fields(data, template):
+        get = _getvalue_for(data)
+        return Checksum._clean_fields([(field, get(data, key, default)) for field, key, default in template])
 
     @staticmethod
     def generic_sort(_list):
-        def compare(item):
-            if isinstance(item, (int, float, str, bool)):
-                return item
-            return str(item)
-        return sorted(_list, key=compare)
+        items = list(_list)
+        if _NATURALLY_ORDERED_TYPES.issuperset(map(type, items)):
+            items.sort()  # same order as _generic_sort_key, without a Python-level call per item
+        else:
+            items.sort(key=_generic_sort_key)
+        return items
 
     @staticmethod
+    @functools.lru_cache(maxsize=64)
     def is_fully_specified_type(_type):
         if not _type:
             return False
@@ -275,6 +349,19 @@ class Checksum:
 
     @staticmethod
     def flatten(input_list, depth=1):
+        if isinstance(input_list, list) and not any(isinstance(item, list) for item in input_list):
+            return input_list  # nothing to flatten, e.g. a single resource given to __init__
+        if depth == 1:  # what __init__ uses, done in one pass without recursing
+            result = []
+            extend = result.extend
+            append = result.append
+            for item in input_list:
+                if isinstance(item, list):
+                    extend(item)
+                else:
+                    append(item)
+            return result
+
         result = []
         for item in input_list:
             if isinstance(item, list) and depth > 0:
@@ -284,69 +371,148 @@ class Checksum:
         return result
 
     def _serialize(self, obj):
-        if isinstance(obj, list) and len(obj) == 1:
-            obj = obj[0]
-        if isinstance(obj, list):
-            return f"[{','.join(map(self._serialize, self.generic_sort(obj)))}]"
-        if isinstance(obj, dict):
-            keys = self.generic_sort(obj.keys())
-            acc = f"{{{json.dumps(keys)}"
-            for key in keys:
-                acc += f"{self._serialize(obj[key])},"
-            return f"{acc}}}"
-        if isinstance(obj, UUID):
-            return json.dumps(str(obj))
-        return json.dumps(obj)
+        return ''.join(self._iter_serialized(obj))
+
+    def _iter_serialized(self, obj, chunk_size=4096):
+        # Iterative walk over an explicit stack; the canonical format must stay byte-compatible with the
+        # checksums already stored by the OCL API, so json.dumps(sort_keys=True) can't be used here.
+        # The hot loop only touches locals, this runs once per node of every resource in a batch.
+        # Output is yielded every chunk_size parts, so large batches can be hashed without building the whole string.
+        parts = []
+        stack = [obj]
+        emit = parts.append
+        push = stack.append
+        pop = stack.pop
+        sort = self.generic_sort
+        dumps = json.dumps
+        cache = self._serialized_cache
+        while stack:
+            if len(parts) >= chunk_size:
+                yield ''.join(parts)
+                parts.clear()
+            obj = pop()
+            if isinstance(obj, _Token):
+                emit(obj)
+                continue
+            if isinstance(obj, list) and len(obj) == 1:
+                obj = obj[0]
+            if isinstance(obj, list):
+                emit('[')
+                push(_LIST_END)
+                items = sort(obj)
+                for index in range(len(items) - 1, -1, -1):
+                    push(items[index])
+                    if index:
+                        push(_LIST_SEPARATOR)
+            elif isinstance(obj, dict):
+                cache_key = _serialized_cache_key(obj)
+                if cache_key is None:
+                    keys = sort(obj.keys())
+                    emit(f"{{{_dumps_keys(keys)}")
+                    push(_DICT_END)
+                    for key in reversed(keys):
+                        push(_DICT_SEPARATOR)
+                        push(obj[key])
+                    continue
+                serialized = cache.get(cache_key)
+                if serialized is None:  # flat dict, so serialized right away
+                    keys = sort(obj.keys())
+                    values = ''.join(_dumps_value(obj[key]) + ',' for key in keys)
+                    serialized = cache[cache_key] = f"{{{_dumps_keys(keys)}{values}}}"
+                emit(serialized)
+            elif isinstance(obj, UUID):
+                emit(dumps(str(obj)))
+            else:
+                emit(_dumps_value(obj))
+        yield ''.join(parts)
 
     @staticmethod
     def _cleanup(fields):
-        result = fields
-        if isinstance(fields, dict):  # pylint: disable=too-many-nested-blocks
-            result = {}
-            for key, value in fields.items():
-                if value is None:
-                    continue
-                if key in [
-                    'retired', 'parent_concept_urls', 'child_concept_urls', 'descriptions', 'extras', 'names',
-                    'locale_preferred', 'name_type', 'description_type'
-                ] and not value:
-                    continue
-                if key in ['names', 'descriptions']:
-                    value = [Checksum._cleanup(val) for val in value]
-                if key in ['is_active'] and value:
-                    continue
-                if not isinstance(value, bool) and isinstance(value, (int, float)):
-                    if int(value) == float(value):
-                        value = int(value)
-                if key in ['extras']:
-                    if isinstance(value, dict) and any(key.startswith('__') for key in value):
-                        value_copied = value.copy()
-                        for extra_key in value:
-                            if extra_key.startswith('__'):
-                                value_copied.pop(extra_key)
-                        value = value_copied
-                result[key] = value
+        if isinstance(fields, dict):
+            if type(fields) is dict and not Checksum._needs_cleanup(fields):
+                return fields  # e.g. the locales already cleaned while extracting the concept fields
+            return Checksum._clean_fields(fields.items())
+        return fields
+
+    @staticmethod
+    def _needs_cleanup(fields):
+        # whether _clean_fields would change anything
+        for key, value in fields.items():
+            if value is None or key in Checksum._LOCALE_KEYS:
+                return True
+            if key in Checksum._DROP_IF_FALSY and not value:
+                return True
+            if key == 'is_active' and value:
+                return True
+            if isinstance(value, float) and value.is_integer():
+                return True
+            if key == 'extras' and isinstance(value, dict) and any(
+                    extra_key.startswith('__') for extra_key in value):
+                return True
+        return False
+
+    @staticmethod
+    def _clean_fields(items):
+        # builds the checksum fields from (key, value) pairs, so extraction and cleanup happen in one pass
+        result = {}
+        for key, value in items:
+            if value is None:
+                continue
+            if key in Checksum._DROP_IF_FALSY and not value:
+                continue
+            if key in Checksum._LOCALE_KEYS:
+                value = [Checksum._cleanup(val) for val in value]
+            if key == 'is_active' and value:
+                continue
+            if isinstance(value, float) and value.is_integer():  # ints (and bools) are left as they are
+                value = int(value)
+            if key == 'extras' and isinstance(value, dict):
+                if any(extra_key.startswith('__') for extra_key in value):
+                    value = {
+                        extra_key: extra_value for extra_key, extra_value in value.items()
+                        if not extra_key.startswith('__')
+                    }
+            result[key] = value
         return result
 
-    def _locales_for_checksums(self, data, relation, predicate_func):
+    def _locales_for_checksums(self, data, relation, predicate_func=None):
         locales = getvalue(data, relation, [])
         locale_func = self.get_concept_name_fields if relation == 'names' else self.get_concept_description_fields
+        if predicate_func is None:
+            return [locale_func(locale) for locale in locales]
         return [locale_func(locale) for locale in locales if predicate_func(locale)]
 
+    @staticmethod
+    def _is_fully_specified_name(locale):
+        return Checksum.is_fully_specified_type(getvalue(locale, 'name_type', None))
+
     def _generate(self, obj, hash_algorithm='MD5'):
         # hex encoding is used to make the hash more readable
-        serialized_obj = self._serialize(obj)
         if self.verbosity:
+            serialized_obj = self._serialize(obj)
             print("\n")
             print("After Serialization")
             print(serialized_obj)
+            chunks = iter([serialized_obj])
+        else:
+            chunks = self._iter_serialized(obj)
+
+        # the first chunk goes to the constructor, most resources serialize to a single chunk and skip update()
+        first_chunk = next(chunks).encode('utf-8')
+        # MD5 stays the default so checksums match the OCL API; other algorithms (e.g. blake2b) are opt-in
+        if hash_algorithm.upper() == 'MD5':
+            hash_func = _md5(first_chunk)
+        else:
+            hash_func = hashlib.new(hash_algorithm, first_chunk)
+        for chunk in chunks:
+            hash_func.update(chunk.encode('utf-8'))
 
-        serialized_obj = serialized_obj.encode('utf-8')
+        return hash_func.hexdigest()
 
-        hash_func = hashlib.new(hash_algorithm)
-        hash_func.update(serialized_obj)
 
-        return hash_func.hexdigest()
+def _generate_checksum(klass, resource, data, checksum_type='standard'):
+    # module level so it can be pickled for the Checksum.generate_batch worker processes
+    return klass(resource, data, checksum_type).generate()
 
 
 def main():
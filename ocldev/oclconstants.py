@@ -83,17 +83,16 @@ class OclConstants(object):
     @staticmethod
     def get_owner_type_stem(owner_type):
         """ Get the URL stem for the specified owner type (eg Organization-->orgs) """
-        if owner_type in OclConstants.OWNER_TYPE_TO_STEM:
-            return OclConstants.OWNER_TYPE_TO_STEM[owner_type]
-        return ''
+        return OclConstants.OWNER_TYPE_TO_STEM.get(owner_type, '')
 
     @staticmethod
     def get_owner_url(owner_id='', include_trailing_slash=False,
                       owner_type=RESOURCE_TYPE_ORGANIZATION):
         """ Returns relative URL for an owner (eg owner or user) """
-        if owner_type not in OclConstants.OWNER_TYPE_TO_STEM:
-            raise Exception('Invalid owner type "%s"' % owner_type)
-        owner_url = '/%s/%s' % (OclConstants.OWNER_TYPE_TO_STEM[owner_type], owner_id)
+        owner_stem = OclConstants.OWNER_TYPE_TO_STEM.get(owner_type)
+        if not owner_stem:
+            raise Exception(f'Invalid owner type "{owner_type}"')
+        owner_url = f'/{owner_stem}/{owner_id}'
         if include_trailing_slash:
             owner_url += '/'
         return owner_url
@@ -101,16 +100,12 @@ class OclConstants(object):
     @staticmethod
     def get_repo_type_stem(repo_type):
         """ Get the URL stem for the specified repository type (eg Source-->sources) """
-        if repo_type in OclConstants.REPO_TYPE_TO_STEM:
-            return OclConstants.REPO_TYPE_TO_STEM[repo_type]
-        return ''
+        return OclConstants.REPO_TYPE_TO_STEM.get(repo_type, '')
 
     @staticmethod
     def get_resource_type_stem(resource_type):
         """ Get the URL stem for the specified resource type (eg Concept-->concepts) """
-        if resource_type in OclConstants.RESOURCE_TYPE_TO_STEM:
-            return OclConstants.RESOURCE_TYPE_TO_STEM[resource_type]
-        return ''
+        return OclConstants.RESOURCE_TYPE_TO_STEM.get(resource_type, '')
 
     @staticmethod
     def get_repository_url(owner_id='', repository_id='', include_trailing_slash=False,
@@ -120,10 +115,10 @@ class OclConstants(object):
         owner_url = OclConstants.get_owner_url(owner_id=owner_id, owner_type=owner_type)
         if not owner_url:
             return ''
-        if repository_type not in OclConstants.REPO_TYPE_TO_STEM:
-            raise Exception('Invalid repository type "%s"' % repository_type)
-        repo_url = '%s/%s/%s' % (
-            owner_url, OclConstants.REPO_TYPE_TO_STEM[repository_type], repository_id)
+        repo_stem = OclConstants.REPO_TYPE_TO_STEM.get(repository_type)
+        if not repo_stem:
+            raise Exception(f'Invalid repository type "{repository_type}"')
+        repo_url = f'{owner_url}/{repo_stem}/{repository_id}'
         if include_trailing_slash:
             repo_url += '/'
         return repo_url
@@ -141,10 +136,10 @@ class OclConstants(object):
             owner_type=owner_type, repository_type=repository_type)
         if not repo_url:
             return ''
-        if resource_type not in OclConstants.RESOURCE_TYPE_TO_STEM:
-            raise Exception('Invalid resource type "%s"' % repository_type)
-        resource_url = '%s/%s/%s' % (
-            repo_url, OclConstants.RESOURCE_TYPE_TO_STEM[resource_type], resource_id)
+        resource_stem = OclConstants.RESOURCE_TYPE_TO_STEM.get(resource_type)
+        if not resource_stem:
+            raise Exception(f'Invalid resource type "{resource_type}"')
+        resource_url = f'{repo_url}/{resource_stem}/{resource_id}'
         if include_trailing_slash:
             resource_url += '/'
         return resource_url
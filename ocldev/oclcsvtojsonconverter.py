@@ -8,15 +8,170 @@ Next steps:
 - Implement support for: (1) Generic Auto Concept References, (2) Generic Standalone References
 - Implement import script validation
 """
+import copy
 import csv
+import functools
 import json
 import re
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 
-import six
+from ocldev import oclconstants
 
-from distutils import util
+try:
+    import orjson
+except ImportError:  # orjson is optional, see OclCsvToJsonConverter.write_jsonl
+    orjson = None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_auto_index_regex(column_prefix, index_prefix, index_regex, index_postfix):
+    """ Return the compiled regex matching an auto-indexed column name, eg "attr_key[001]" """
+    return re.compile(r'^%s%s(%s)%s$' % (
+        column_prefix, re.escape(index_prefix), index_regex, re.escape(index_postfix)))
+
+
+def _get_auto_index_column_prefix(column_prefix, index_prefix):
+    """
+    Return the literal start of an auto-indexed column name, eg "attr_key[", used to skip the
+    regex for columns that cannot match. Returns '' if column_prefix contains regex syntax.
+    """
+    if re.escape(column_prefix) != column_prefix:
+        return ''
+    return column_prefix + index_prefix
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_standard_attribute_column(column_name, standard_needle):
+    """
+    Return the key and data type of a standard auto-attribute column, eg ('count', 'int') for
+    'attr:count:int'. Column names repeat for every row, so the result is cached.
+    """
+    data_type = 'str'
+    if column_name.count(':') == 2:
+        suffix_part = column_name.split(':')[2].strip()
+        if suffix_part in ['bool', 'str', 'int', 'float', 'list', 'json']:
+            data_type = suffix_part
+    key_name = column_name[len(standard_needle):]
+    if key_name.endswith(":" + data_type):
+        key_name = key_name.replace(":" + data_type, "")
+    return key_name, data_type
+
+
+def _strtobool(value):
+    """ Convert a string representation of truth to True or False, same as distutils.util.strtobool """
+    value = value.lower()
+    if value in ('y', 'yes', 't', 'true', 'on', '1'):
+        return True
+    if value in ('n', 'no', 'f', 'false', 'off', '0'):
+        return False
+    raise ValueError('invalid truth value %r' % (value,))
+
+
+@functools.lru_cache(maxsize=16)
+def _get_identifier_translation_table(chars_to_remove, replace_char):
+    """ Return a str.translate table replacing each of chars_to_remove with replace_char """
+    return {ord(char): replace_char for char in chars_to_remove}
+
+
+@functools.lru_cache(maxsize=64)
+def _classify_auto_attribute_columns(column_names, standard_needle, key_column_prefix,
+                                     value_column_prefix, index_prefix, index_regex, index_postfix):
+    """
+    Return a tuple of (column_name, column_type, key_name_or_index, data_type) for each auto
+    attribute column in column_names, where column_type is 'standard', 'key' or 'value'. Other
+    columns are left out, so that rows only need to look at the auto attribute columns.
+    """
+    key_regex = _compile_auto_index_regex(key_column_prefix, index_prefix, index_regex, index_postfix)
+    value_regex = _compile_auto_index_regex(value_column_prefix, index_prefix, index_regex, index_postfix)
+    key_prefix = _get_auto_index_column_prefix(key_column_prefix, index_prefix)
+    value_prefix = _get_auto_index_column_prefix(value_column_prefix, index_prefix)
+    attribute_columns = []
+    for column_name in column_names:
+        if column_name.startswith(standard_needle):
+            key_name, data_type = _parse_standard_attribute_column(column_name, standard_needle)
+            attribute_columns.append((column_name, 'standard', key_name, data_type))
+            continue
+        regex_match = None
+        if column_name.startswith(key_prefix):
+            regex_match = key_regex.match(column_name)
+        if regex_match:
+            attribute_columns.append((column_name, 'key', regex_match.group(1), None))
+            continue
+        if column_name.startswith(value_prefix):
+            regex_match = value_regex.match(column_name)
+        if regex_match:
+            attribute_columns.append((column_name, 'value', regex_match.group(1), None))
+    return tuple(attribute_columns)
+
+
+_MISSING = object()  # Marks a column missing from a CSV row, as opposed to an empty value
+
+
+def _to_list(value):
+    """ Convert a string like '[a, b]' to a list of strings """
+    return [v.strip() for v in value.strip('][').split(',')]
+
+
+def _to_json(value):
+    """ Parse value as JSON, returning it unchanged if it is not valid JSON """
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return value
 
-from ocldev import oclconstants
+
+def _to_json_line(value, use_orjson=False):
+    """
+    Serialize value as a line of compact JSON. The standard json module is set to write the same
+    separators and unescaped non-ASCII characters as orjson, which is used if requested and installed.
+    """
+    if use_orjson and orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_APPEND_NEWLINE).decode('utf-8')
+        except TypeError:  # Values orjson does not support, eg integers larger than 64 bits
+            pass
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+
+# Converters used by OclCsvToJsonConverter.do_datatype_conversion, by datatype name
+_DATATYPE_CONVERTERS = {
+    'bool': lambda value: _strtobool(str(value)),
+    'int': int,
+    'float': float,
+    'list': _to_list,
+    'json': _to_json,
+}
+
+
+class OclCsvRow(Mapping):
+    """
+    Read-only CSV row that stores its values in a tuple and shares the column index with all other
+    rows of the same file, instead of holding a full dictionary per row. copy() returns the row as
+    a regular dictionary, same as a csv.DictReader row.
+    """
+
+    __slots__ = ('_values', '_column_index')
+
+    def __init__(self, values, column_index):
+        self._values = values
+        self._column_index = column_index
+
+    def __getitem__(self, column_name):
+        return self._values[self._column_index[column_name]]
+
+    def __iter__(self):
+        return iter(self._column_index)
+
+    def __len__(self):
+        return len(self._column_index)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def copy(self):
+        """ Return the row as a dictionary, eg for it to be modified while preprocessing """
+        return {column_name: self._values[index] for column_name, index in self._column_index.items()}
 
 
 class OclCsvToJsonConverter(object):
@@ -67,44 +222,93 @@ class OclCsvToJsonConverter(object):
     REPLACE_CHAR = '-'
 
     def __init__(self, csv_filename='', input_list=None,
-                 csv_resource_definitions=None, verbose=False, allow_special_characters=False):
+                 csv_resource_definitions=None, verbose=False, allow_special_characters=False,
+                 input_iter=None):
         """
         Initialize this object
         :param csv_filename: <string> Filename to load CSV data from; use "input_list"
-            if CSV already loaded into list
+            if CSV already loaded into list. The file is only loaded into input_list when needed.
         :param input_list: <list> List of dictionaries objects representing each row of the CSV file
         :param csv_resource_definitions: <dict> Properly formatted dictionary defining
             how to convert CSV to OCL-JSON
         :param verbose: <int> 0=off, 1=some debug info, 2=all debug info
         :param allow_special_characters: <bool> concept id special characters will not be replaced by `-`
+        :param input_iter: <iterable> Rows of the CSV to process lazily, eg a generator, instead
+            of an "input_list"; process_by_row consumes it one row at a time
         """
         self.allow_special_characters = allow_special_characters
         self.csv_filename = csv_filename
+        self.input_iter = input_iter
         self.input_list = input_list
-        if csv_filename:
-            self.load_csv(csv_filename)
         self.verbose = verbose
         self.set_resource_definitions(csv_resource_definitions=csv_resource_definitions)
         self.output_list = []
         self._current_row_num = 0
         self._total_rows = 0
+        self._auto_indexes_cache = {}
+        self._resource_def_cache = {}
 
     def preprocess_csv_row(self, row, attr=None):
-        """ Method intended to be overwritten in classes that extend this object """
+        """
+        Method intended to be overwritten in classes that extend this object. Rows are copied
+        before being passed here and may be modified. If this method is not overwritten, rows are
+        processed without copying them, so they must not be modified while being processed.
+        """
         return row
 
     def set_resource_definitions(self, csv_resource_definitions=None):
         """ Set CSV resource definitions to use to convert to JSON """
         self.csv_resource_definitions = csv_resource_definitions
 
+    @property
+    def input_list(self):
+        """
+        List of the CSV rows. If initialized with a csv_filename or an input_iter, the rows are
+        loaded the first time the list is used, since process_by_row can stream them instead.
+        """
+        if self._input_list is None:
+            if self.csv_filename:
+                self.load_csv(self.csv_filename)
+            elif self.input_iter is not None:
+                self._input_list = list(self.input_iter)
+        return self._input_list
+
+    @input_list.setter
+    def input_list(self, input_list):
+        self._input_list = input_list
+
     def load_csv(self, csv_filename):
         """ Load CSV file into the input_list """
-        input_list = []
-        with open(csv_filename) as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                input_list.append(row)
-        self.input_list = input_list
+        self.input_list = list(self.iter_csv_rows(csv_filename))
+
+    @staticmethod
+    def iter_csv_rows(csv_filename):
+        """
+        Iterate through the rows of a CSV file without loading the whole file. Rows are returned
+        as OclCsvRow objects sharing the column index of the header, rows not matching the
+        header length are returned as a dictionary the same way csv.DictReader does.
+        """
+        with open(csv_filename, newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if header is None:
+                return
+            column_index = {}
+            for index, column_name in enumerate(header):
+                column_index[column_name] = index  # Last column wins for duplicates, as in DictReader
+            for values in reader:
+                if not values:
+                    continue
+                if len(values) == len(header):
+                    yield OclCsvRow(tuple(values), column_index)
+                    continue
+                row = dict(zip(header, values))
+                if len(values) > len(header):
+                    row[None] = values[len(header):]
+                else:
+                    for column_name in header[len(values):]:
+                        row[column_name] = None
+                yield row
 
     def process(self, method=PROCESS_BY_DEFINITION, num_rows=0, attr=None):
         """ Process CSV into OCL-formatted JSON """
@@ -114,57 +318,171 @@ class OclCsvToJsonConverter(object):
 
     def process_by_row(self, num_rows=0, attr=None):
         """ Process CSV by applying all definitions to each row before moving to the next row """
-        if self.csv_filename:
-            self.load_csv(self.csv_filename)
-        self._current_row_num = 0
-        self._total_rows = len(self.input_list)
         self.output_list = []
-        for csv_row in self.input_list:
+        self.output_list.extend(self.iter_process_by_row(num_rows=num_rows, attr=attr))
+        return self.output_list
+
+    def iter_process_by_row(self, num_rows=0, attr=None):
+        """
+        Same as process_by_row, but OCL resources are yielded as each row is processed instead of
+        being collected in output_list. Unless input_list was already loaded, rows are streamed
+        from the CSV file or input_iter, so that only one row at a time is held in memory.
+        """
+        # Rows are loaded through input_list if a subclass overrides load_csv, and for verbose
+        # output, which reports the row count
+        is_streamed = self._input_list is None and not self.verbose
+        if is_streamed and self.csv_filename and type(self).load_csv is OclCsvToJsonConverter.load_csv:
+            csv_rows = self.iter_csv_rows(self.csv_filename)
+            self._total_rows = 0
+        elif is_streamed and not self.csv_filename and self.input_iter is not None:
+            csv_rows = self.input_iter
+            self._total_rows = 0
+        else:
+            csv_rows = self.input_list
+            self._total_rows = len(csv_rows)
+        self._current_row_num = 0
+        self._auto_indexes_cache = {}  # Definitions may have been edited since the last run
+        self._resource_def_cache = {}
+        is_preprocessed = type(self).preprocess_csv_row is not OclCsvToJsonConverter.preprocess_csv_row
+
+        # Rows are dispatched to the active definitions they can trigger, looked up by the row's
+        # values for all trigger columns and kept in definition order. A subclass overriding
+        # process_csv_row_with_definition may handle triggers differently, so it gets every row.
+        active_defs = self.get_active_definitions()
+        is_dispatched = (type(self).process_csv_row_with_definition is
+                         OclCsvToJsonConverter.process_csv_row_with_definition)
+        trigger_columns = tuple(dict.fromkeys(
+            csv_resource_def[self.DEF_KEY_TRIGGER_COLUMN] for csv_resource_def in active_defs
+            if self.DEF_KEY_TRIGGER_COLUMN in csv_resource_def))
+        row_defs_by_trigger_values = {}
+        for csv_row in csv_rows:
             if num_rows and self._current_row_num >= num_rows:
                 break
             self._current_row_num += 1
-            csv_row = self.preprocess_csv_row(csv_row.copy(), attr)
-            for csv_resource_def in self.csv_resource_definitions:
-                if (self.DEF_KEY_IS_ACTIVE in csv_resource_def and not csv_resource_def[
-                        self.DEF_KEY_IS_ACTIVE]):
-                    continue
+            if is_preprocessed:
+                csv_row = self.preprocess_csv_row(csv_row.copy(), attr)
+            elif not isinstance(csv_row, dict):
+                csv_row = csv_row.copy()  # Dictionary lookups are faster than OclCsvRow lookups
+            row_defs = active_defs
+            if is_dispatched:
+                trigger_values = tuple(csv_row.get(column, _MISSING) for column in trigger_columns)
+                try:
+                    row_defs = row_defs_by_trigger_values.get(trigger_values)
+                    if row_defs is None:
+                        row_defs = self.get_triggered_definitions(
+                            active_defs, dict(zip(trigger_columns, trigger_values)))
+                        row_defs_by_trigger_values[trigger_values] = row_defs
+                except TypeError:  # Unhashable values set by preprocess_csv_row
+                    row_defs = active_defs
+            for csv_resource_def in row_defs:
                 ocl_resources = self.process_csv_row_with_definition(
                     csv_row, csv_resource_def, attr=attr)
                 if ocl_resources and isinstance(ocl_resources, dict):  # Single OCL resource
-                    self.output_list.append(ocl_resources)
+                    yield ocl_resources
                 elif ocl_resources and isinstance(ocl_resources, list):  # List of OCL resources
-                    self.output_list += ocl_resources
+                    for ocl_resource in ocl_resources:
+                        yield ocl_resource
+
+    def write_jsonl(self, output_file, num_rows=0, attr=None, use_orjson=False):
+        """
+        Process CSV by row and write each OCL resource to output_file, an open text file, as a
+        line of compact JSON without collecting the resources in output_list. Set use_orjson to
+        serialize faster with orjson if it is installed; lines are the same as with the standard
+        json module, except for floats in exponent notation and NaN/Infinity. Returns the number
+        of resources written.
+        """
+        num_resources = 0
+        for ocl_resource in self.iter_process_by_row(num_rows=num_rows, attr=attr):
+            output_file.write(_to_json_line(ocl_resource, use_orjson=use_orjson))
+            num_resources += 1
+        return num_resources
+
+    def process_by_row_parallel(self, num_rows=0, attr=None, max_workers=None, chunksize=1000):
+        """
+        Same as process_by_row, but chunks of rows are processed in parallel worker processes.
+        The converter (including subclasses) must be picklable. Verbose output reports row
+        numbers, so it always processes the rows in this process.
+        """
+        if self.verbose or max_workers == 1:
+            return self.process_by_row(num_rows=num_rows, attr=attr)
+        csv_rows = self.input_list[:num_rows or None]
+
+        # Workers get a copy of the converter without the rows, which are sent in chunks instead
+        converter = copy.copy(self)
+        converter.csv_filename = ''
+        converter.input_list = []
+        converter._auto_indexes_cache = {}
+        converter._resource_def_cache = {}
+        process_chunk = functools.partial(_process_csv_rows, converter, attr=attr)
+        chunks = [csv_rows[i:i + chunksize] for i in range(0, len(csv_rows), chunksize)]
+
+        self.output_list = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for ocl_resources in executor.map(process_chunk, chunks):
+                self.output_list.extend(ocl_resources)
         return self.output_list
 
     def process_by_definition(self, num_rows=0, attr=None):
         """ Process the CSV file by looping through it entirely once for each definition """
-        if self.csv_filename:
-            self.load_csv(self.csv_filename)
         self.output_list = []
+        append = self.output_list.append
+        extend = self.output_list.extend
         self._total_rows = len(self.input_list)
-        for csv_resource_def in self.csv_resource_definitions:
-            if self.DEF_KEY_IS_ACTIVE in csv_resource_def and not csv_resource_def[
-                    self.DEF_KEY_IS_ACTIVE]:
-                continue
+        self._auto_indexes_cache = {}  # Definitions may have been edited since the last run
+        self._resource_def_cache = {}
+
+        # Rows are only copied if a subclass preprocesses them, in which case each definition gets
+        # its own preprocessed copy. OclCsvRows are converted to dictionaries once for faster lookups.
+        is_preprocessed = type(self).preprocess_csv_row is not OclCsvToJsonConverter.preprocess_csv_row
+        if is_preprocessed:
+            input_list = self.input_list
+        else:
+            input_list = [csv_row if isinstance(csv_row, dict) else csv_row.copy()
+                          for csv_row in self.input_list[:num_rows or None]]
+
+        for csv_resource_def in self.get_active_definitions():
             if self.verbose:
-                six.print_(('\n%s' % ('*' * 120)))
-                six.print_(('Processing definition: %s' % csv_resource_def['definition_name']))
+                print('\n%s' % ('*' * 120))
+                print('Processing definition: %s' % csv_resource_def['definition_name'])
                 # print csv_resource_def
-                six.print_(('*' * 120))
+                print('*' * 120)
             self._current_row_num = 0
-            for csv_row in self.input_list:
+            for csv_row in input_list:
                 if num_rows and self._current_row_num >= num_rows:
                     break
                 self._current_row_num += 1
-                csv_row = self.preprocess_csv_row(csv_row.copy(), attr)
+                if is_preprocessed:
+                    csv_row = self.preprocess_csv_row(csv_row.copy(), attr)
                 ocl_resources = self.process_csv_row_with_definition(
                     csv_row, csv_resource_def, attr=attr)
                 if ocl_resources and isinstance(ocl_resources, dict):  # Single OCL resource
-                    self.output_list.append(ocl_resources)
+                    append(ocl_resources)
                 elif ocl_resources and isinstance(ocl_resources, list):  # List of OCL resources
-                    self.output_list += ocl_resources
+                    extend(ocl_resources)
         return self.output_list
 
+    def get_active_definitions(self):
+        """ Returns the CSV resource definitions that are not deactivated """
+        return [csv_resource_def for csv_resource_def in self.csv_resource_definitions if not (
+            self.DEF_KEY_IS_ACTIVE in csv_resource_def and not csv_resource_def[self.DEF_KEY_IS_ACTIVE])]
+
+    def get_triggered_definitions(self, csv_resource_defs, trigger_values):
+        """
+        Returns the definitions that can be triggered by a row with the specified trigger column
+        values. Definitions that process_csv_row_with_definition would reject with an error are
+        kept so that the error is still raised.
+        """
+        triggered_defs = []
+        for csv_resource_def in csv_resource_defs:
+            if (self.DEF_KEY_RESOURCE_TYPE in csv_resource_def and
+                    self.DEF_KEY_TRIGGER_COLUMN in csv_resource_def and
+                    self.DEF_KEY_TRIGGER_VALUE in csv_resource_def and
+                    trigger_values[csv_resource_def[self.DEF_KEY_TRIGGER_COLUMN]] != csv_resource_def[
+                        self.DEF_KEY_TRIGGER_VALUE]):
+                continue
+            triggered_defs.append(csv_resource_def)
+        return triggered_defs
+
     def process_csv_row_with_definition(self, csv_row, csv_resource_def, attr=None):
         """ Process individual CSV row with the provided CSV resource definition """
 
@@ -195,7 +513,7 @@ class OclCsvToJsonConverter(object):
         if ocl_resource_type == OclCsvToJsonConverter.DEF_TYPE_AUTO_RESOURCE:
             auto_resource_def_template = csv_resource_def[
                 OclCsvToJsonConverter.DEF_AUTO_RESOURCE_TEMPLATE]
-            unique_auto_resource_indexes = OclCsvToJsonConverter.get_unique_csv_row_auto_indexes(
+            unique_auto_resource_indexes = self.get_cached_csv_row_auto_indexes(
                 index_prefix=auto_resource_def_template[self.DEF_KEY_AUTO_INDEX_PREFIX],
                 index_postfix=auto_resource_def_template[self.DEF_KEY_AUTO_INDEX_POSTFIX],
                 index_regex=auto_resource_def_template[self.DEF_KEY_AUTO_INDEX_REGEX],
@@ -203,7 +521,7 @@ class OclCsvToJsonConverter(object):
                 csv_row=csv_row)
             ocl_resources = []
             for auto_index in unique_auto_resource_indexes:
-                resource_def = OclCsvToJsonConverter.generate_resource_def_from_template(
+                resource_def = self.get_cached_resource_def_from_template(
                     auto_resource_index=auto_index,
                     index_prefix=auto_resource_def_template[self.DEF_KEY_AUTO_INDEX_PREFIX],
                     index_postfix=auto_resource_def_template[self.DEF_KEY_AUTO_INDEX_POSTFIX],
@@ -222,18 +540,12 @@ class OclCsvToJsonConverter(object):
         TODO: Provide attribute to skip if ANY column is blank instead of ALL
         """
         is_skip_row = False
-        if self.DEF_KEY_SKIP_IF_EMPTY in csv_resource_def and csv_resource_def[
-                self.DEF_KEY_SKIP_IF_EMPTY]:
-            has_non_empty_cell = False
-            skip_columns = csv_resource_def[self.DEF_KEY_SKIP_IF_EMPTY]
+        skip_columns = csv_resource_def.get(self.DEF_KEY_SKIP_IF_EMPTY)
+        if skip_columns:
             if not isinstance(skip_columns, list):
                 skip_columns = [skip_columns]
-            for skip_column in skip_columns:
-                if skip_column in csv_row and csv_row[skip_column] != '':
-                    has_non_empty_cell = True
-                    break
-            if not has_non_empty_cell:
-                is_skip_row = True
+            # Missing columns count as empty, but None (ie a short CSV row) does not
+            is_skip_row = all(csv_row.get(skip_column, '') == '' for skip_column in skip_columns)
         elif OclCsvToJsonConverter.DEF_KEY_SKIP_HANDLER in csv_resource_def:
             handler = getattr(self, csv_resource_def[OclCsvToJsonConverter.DEF_KEY_SKIP_HANDLER])
             if not handler:
@@ -245,6 +557,7 @@ class OclCsvToJsonConverter(object):
 
     def build_resource(self, csv_row, csv_resource_def, attr=None):
         """ Build an OCL resource """
+        constants = oclconstants.OclConstants
 
         # Start building the resource
         ocl_resource_type = csv_resource_def[self.DEF_KEY_RESOURCE_TYPE]
@@ -256,9 +569,7 @@ class OclCsvToJsonConverter(object):
             id_column = csv_resource_def[self.DEF_KEY_ID_COLUMN]
             if id_column not in csv_row or not csv_row[id_column]:
                 raise Exception('ID column %s not set or empty in row %s' % (id_column, csv_row))
-            if ocl_resource_type in [
-                    oclconstants.OclConstants.RESOURCE_TYPE_CONCEPT,
-                    oclconstants.OclConstants.RESOURCE_TYPE_MAPPING]:
+            if ocl_resource_type in [constants.RESOURCE_TYPE_CONCEPT, constants.RESOURCE_TYPE_MAPPING]:
                 ocl_resource['id'] = self.format_identifier(
                     csv_row[id_column], allow_underscore=True)
             else:
@@ -270,85 +581,79 @@ class OclCsvToJsonConverter(object):
                 csv_row, csv_resource_def[self.DEF_CORE_FIELDS]))
 
         # Build mapping to/from concept URLs if not provided
-        if ocl_resource_type == oclconstants.OclConstants.RESOURCE_TYPE_MAPPING:
+        if ocl_resource_type == constants.RESOURCE_TYPE_MAPPING:
             # Determine whether mapping target is internal or external
-            map_target = ocl_resource.pop(
-                oclconstants.OclConstants.MAPPING_TARGET,
-                oclconstants.OclConstants.MAPPING_TARGET_INTERNAL)
-            if map_target not in oclconstants.OclConstants.MAPPING_TARGETS:
-                map_target = oclconstants.OclConstants.MAPPING_TARGET_INTERNAL
+            map_target = ocl_resource.pop(constants.MAPPING_TARGET, constants.MAPPING_TARGET_INTERNAL)
+            if map_target not in constants.MAPPING_TARGETS:
+                map_target = constants.MAPPING_TARGET_INTERNAL
 
             # Build from_concept_url if not provided
-            ocl_resource[oclconstants.OclConstants.MAPPING_FROM_CONCEPT_URL] = OclCsvToJsonConverter.get_concept_url(
-                concept_url=ocl_resource.pop(oclconstants.OclConstants.MAPPING_FROM_CONCEPT_URL, ''),
-                owner_id=ocl_resource.pop(oclconstants.OclConstants.MAPPING_FROM_CONCEPT_OWNER_ID, ''),
+            ocl_resource[constants.MAPPING_FROM_CONCEPT_URL] = OclCsvToJsonConverter.get_concept_url(
+                concept_url=ocl_resource.pop(constants.MAPPING_FROM_CONCEPT_URL, ''),
+                owner_id=ocl_resource.pop(constants.MAPPING_FROM_CONCEPT_OWNER_ID, ''),
                 owner_type=ocl_resource.pop(
-                    oclconstants.OclConstants.MAPPING_FROM_CONCEPT_OWNER_TYPE,
-                    oclconstants.OclConstants.RESOURCE_TYPE_ORGANIZATION),
-                source=ocl_resource.pop(oclconstants.OclConstants.MAPPING_FROM_SOURCE_ID, ''),
-                concept_id=ocl_resource.pop(oclconstants.OclConstants.MAPPING_FROM_CONCEPT_ID, ''))
+                    constants.MAPPING_FROM_CONCEPT_OWNER_TYPE, constants.RESOURCE_TYPE_ORGANIZATION),
+                source=ocl_resource.pop(constants.MAPPING_FROM_SOURCE_ID, ''),
+                concept_id=ocl_resource.pop(constants.MAPPING_FROM_CONCEPT_ID, ''))
 
             # Handle to_concept_url based on Internal or External map target
-            if map_target == oclconstants.OclConstants.MAPPING_TARGET_INTERNAL:
+            if map_target == constants.MAPPING_TARGET_INTERNAL:
                 # JSON internal mapping requires map_type, from_concept_url, and to_concept_url
-                ocl_resource[oclconstants.OclConstants.MAPPING_TO_CONCEPT_URL] = OclCsvToJsonConverter.get_concept_url(
-                    concept_url=ocl_resource.pop(oclconstants.OclConstants.MAPPING_TO_CONCEPT_URL, ''),
-                    owner_id=ocl_resource.pop(oclconstants.OclConstants.MAPPING_TO_CONCEPT_OWNER_ID, ''),
+                ocl_resource[constants.MAPPING_TO_CONCEPT_URL] = OclCsvToJsonConverter.get_concept_url(
+                    concept_url=ocl_resource.pop(constants.MAPPING_TO_CONCEPT_URL, ''),
+                    owner_id=ocl_resource.pop(constants.MAPPING_TO_CONCEPT_OWNER_ID, ''),
                     owner_type=ocl_resource.pop(
-                        oclconstants.OclConstants.MAPPING_TO_CONCEPT_OWNER_TYPE,
-                        oclconstants.OclConstants.RESOURCE_TYPE_ORGANIZATION),
-                    source=ocl_resource.pop(oclconstants.OclConstants.MAPPING_TO_SOURCE_ID, ''),
-                    concept_id=ocl_resource.pop(oclconstants.OclConstants.MAPPING_TO_CONCEPT_ID, ''))
-            elif map_target == oclconstants.OclConstants.MAPPING_TARGET_EXTERNAL:
+                        constants.MAPPING_TO_CONCEPT_OWNER_TYPE, constants.RESOURCE_TYPE_ORGANIZATION),
+                    source=ocl_resource.pop(constants.MAPPING_TO_SOURCE_ID, ''),
+                    concept_id=ocl_resource.pop(constants.MAPPING_TO_CONCEPT_ID, ''))
+            elif map_target == constants.MAPPING_TARGET_EXTERNAL:
                 # JSON external mapping needs map_type, from_concept_url, to_source_url and
                 # to_concept_code. to_concept_name is optional.
-                if oclconstants.OclConstants.MAPPING_TO_CONCEPT_URL in ocl_resource and ocl_resource[oclconstants.OclConstants.MAPPING_TO_CONCEPT_URL]:
+                if constants.MAPPING_TO_CONCEPT_URL in ocl_resource and ocl_resource[constants.MAPPING_TO_CONCEPT_URL]:
                     err_msg = ('External mapping must not have a '
-                               '"to_concept_url": %s' % ocl_resource[oclconstants.OclConstants.MAPPING_TO_CONCEPT_URL])
+                               '"to_concept_url": %s' % ocl_resource[constants.MAPPING_TO_CONCEPT_URL])
                     raise Exception(err_msg)
-                ocl_resource[oclconstants.OclConstants.MAPPING_TO_SOURCE_URL] = OclCsvToJsonConverter._get_external_mapping_to_source_url(
-                    to_source_url=ocl_resource.pop(oclconstants.OclConstants.MAPPING_TO_SOURCE_URL, ''),
-                    to_concept_owner_id=ocl_resource.pop(oclconstants.OclConstants.MAPPING_TO_CONCEPT_OWNER_ID, ''),
+                ocl_resource[constants.MAPPING_TO_SOURCE_URL] = OclCsvToJsonConverter._get_external_mapping_to_source_url(
+                    to_source_url=ocl_resource.pop(constants.MAPPING_TO_SOURCE_URL, ''),
+                    to_concept_owner_id=ocl_resource.pop(constants.MAPPING_TO_CONCEPT_OWNER_ID, ''),
                     to_concept_owner_type=ocl_resource.pop(
-                        oclconstants.OclConstants.MAPPING_TO_CONCEPT_OWNER_TYPE,
-                        oclconstants.OclConstants.RESOURCE_TYPE_ORGANIZATION),
-                    to_concept_source=ocl_resource.pop(oclconstants.OclConstants.MAPPING_TO_SOURCE_ID, ''))
+                        constants.MAPPING_TO_CONCEPT_OWNER_TYPE, constants.RESOURCE_TYPE_ORGANIZATION),
+                    to_concept_source=ocl_resource.pop(constants.MAPPING_TO_SOURCE_ID, ''))
 
         # Set sub-resources, eg concept names/descriptions
-        if self.DEF_SUB_RESOURCES in csv_resource_def and csv_resource_def[self.DEF_SUB_RESOURCES]:
-            for group_name in csv_resource_def[self.DEF_SUB_RESOURCES]:  # eg "names","descriptions"
-                ocl_resource[group_name] = []
-                for dict_def in csv_resource_def[self.DEF_SUB_RESOURCES][group_name]:
+        sub_resource_defs = csv_resource_def.get(self.DEF_SUB_RESOURCES)
+        if sub_resource_defs:
+            for group_name in sub_resource_defs:  # eg "names","descriptions"
+                ocl_sub_resources = ocl_resource[group_name] = []
+                for dict_def in sub_resource_defs[group_name]:
                     ocl_sub_resource = self.process_resource_def(csv_row, dict_def)
                     if ocl_sub_resource:
-                        ocl_resource[group_name].append(ocl_sub_resource)
+                        ocl_sub_resources.append(ocl_sub_resource)
 
         # Key value pairs, eg custom attributes
-        if self.DEF_KEY_VALUE_PAIRS in csv_resource_def and csv_resource_def[
-                self.DEF_KEY_VALUE_PAIRS]:
-            for group_name in csv_resource_def[self.DEF_KEY_VALUE_PAIRS]:
-                ocl_resource[group_name] = {}
-                for kvp_def in csv_resource_def[self.DEF_KEY_VALUE_PAIRS][group_name]:
+        kvp_defs = csv_resource_def.get(self.DEF_KEY_VALUE_PAIRS)
+        if kvp_defs:
+            for group_name in kvp_defs:
+                key_value_pairs = ocl_resource[group_name] = {}
+                for kvp_def in kvp_defs[group_name]:
                     # Key
-                    key = None
-                    if 'key' in kvp_def and kvp_def['key']:
-                        key = kvp_def['key']
-                    elif 'key_column' in kvp_def and kvp_def['key_column']:
-                        if kvp_def['key_column'] in csv_row and csv_row[kvp_def['key_column']]:
-                            key = csv_row[kvp_def['key_column']]
-                        else:
+                    key = kvp_def.get('key')
+                    if not key:
+                        key_column = kvp_def.get('key_column')
+                        if not key_column:
+                            err_msg = ('Expected "key" or "key_column" key in key_value_pair '
+                                       'definition, but neither found: %s' % kvp_def)
+                            raise Exception(err_msg)
+                        key = csv_row.get(key_column)
+                        if not key:
                             err_msg = ('key_column "%s" must be non-empty in CSV within '
-                                       'key_value_pair: %s' % (kvp_def['key_column'], kvp_def))
+                                       'key_value_pair: %s' % (key_column, kvp_def))
                             raise Exception(err_msg)
-                    else:
-                        err_msg = ('Expected "key" or "key_column" key in key_value_pair '
-                                   'definition, but neither found: %s' % kvp_def)
-                        raise Exception(err_msg)
 
                     # Value
                     if 'value' in kvp_def:
                         value = kvp_def['value']
-                    elif 'value_column' in kvp_def and kvp_def['value_column']:
+                    elif kvp_def.get('value_column'):
                         if kvp_def['value_column'] in csv_row:
                             value = csv_row[kvp_def['value_column']]
                         else:
@@ -361,9 +666,8 @@ class OclCsvToJsonConverter(object):
                         raise Exception(err_msg)
 
                     # Set the key-value pair
-                    if key and (value or ('omit_if_empty_value' in kvp_def and not kvp_def[
-                            'omit_if_empty_value'])):
-                        ocl_resource[group_name][key] = value
+                    if value or not kvp_def.get('omit_if_empty_value', True):
+                        key_value_pairs[key] = value
 
         # Handle auto-names
         if self.DEF_AUTO_CONCEPT_NAMES in csv_resource_def:
@@ -389,10 +693,10 @@ class OclCsvToJsonConverter(object):
         # Optionally display debug info
         if self.verbose:
             if self._current_row_num:
-                six.print_(('[Row %s of %s] %s' % (self._current_row_num, self._total_rows,
-                                             json.dumps(ocl_resource))))
+                print('[Row %s of %s] %s' % (self._current_row_num, self._total_rows,
+                                             json.dumps(ocl_resource)))
             else:
-                six.print_((json.dumps(ocl_resource)))
+                print(json.dumps(ocl_resource))
 
         return ocl_resource
 
@@ -425,70 +729,54 @@ class OclCsvToJsonConverter(object):
                 'omit_if_empty_value']:
             omit_if_empty_value = False
 
-        # Prepare search strings
-        standard_needle = '%s%s' % (
-            auto_attributes_def['standard_column_prefix'], auto_attributes_def['separator'])
-        key_needle = '^%s%s(%s)%s$' % (
+        # Classify the columns once per CSV header, eg ('attr_key[01]', 'key', '01', None)
+        attribute_columns = _classify_auto_attribute_columns(
+            tuple(csv_row),
+            '%s%s' % (auto_attributes_def['standard_column_prefix'], auto_attributes_def['separator']),
             auto_attributes_def['key_column_prefix'],
-            re.escape(auto_attributes_def[self.DEF_KEY_AUTO_INDEX_PREFIX]),
-            auto_attributes_def[self.DEF_KEY_AUTO_INDEX_REGEX],
-            re.escape(auto_attributes_def[self.DEF_KEY_AUTO_INDEX_POSTFIX]))
-        value_needle = '^%s%s(%s)%s$' % (
             auto_attributes_def['value_column_prefix'],
-            re.escape(auto_attributes_def[self.DEF_KEY_AUTO_INDEX_PREFIX]),
+            auto_attributes_def[self.DEF_KEY_AUTO_INDEX_PREFIX],
             auto_attributes_def[self.DEF_KEY_AUTO_INDEX_REGEX],
-            re.escape(auto_attributes_def[self.DEF_KEY_AUTO_INDEX_POSTFIX]))
-
-        data_types = ['bool', 'str', 'int', 'float', 'list', 'json']
+            auto_attributes_def[self.DEF_KEY_AUTO_INDEX_POSTFIX])
 
         # Process CSV columns
-        for column_name in csv_row:
-            data_type = 'str'
-            if column_name.count(':') == 2:
-                suffix_part = column_name.split(':')[2].strip()
-                if suffix_part in data_types:
-                    data_type = suffix_part
-            if column_name[:len(standard_needle)] == standard_needle:
-                # Check if standard attr (e.g. attr:my-custom-attr)
+        for column_name, column_type, name_or_index, data_type in attribute_columns:
+            if column_type == 'standard':
+                # Standard attr (e.g. attr:my-custom-attr)
                 if not omit_if_empty_value or (omit_if_empty_value and csv_row[column_name]):
-                    key_name = column_name[len(standard_needle):]
-                    if key_name.endswith(":" + data_type):
-                        key_name = key_name.replace(":" + data_type, "")
-                    extra_attributes[key_name] = self.do_datatype_conversion(csv_row[column_name], data_type)
+                    extra_attributes[name_or_index] = self.do_datatype_conversion(
+                        csv_row[column_name], data_type)
+            elif column_type == 'key':
+                key_index = name_or_index
+                if not key_index:
+                    # Invalid (ie blank) auto index
+                    raise Exception("Auto indexes must be non-empty")
+                elif not csv_row[column_name]:
+                    # Skip if the key is empty
+                    continue
+                elif key_index in keyless_values:
+                    # We now have a key/value pair
+                    extra_attributes[csv_row[column_name]] = keyless_values.pop(key_index)
+                else:
+                    # Save and continue processing columns
+                    key_name = csv_row[column_name]
+                    valueless_keys[key_index] = key_name
             else:
-                key_regex_match = re.search(key_needle, column_name)
-                value_regex_match = re.search(value_needle, column_name)
-                if key_regex_match:
-                    key_index = key_regex_match.group(1)
-                    if not key_index:
-                        # Invalid (ie blank) auto index
-                        raise Exception("Auto indexes must be non-empty")
-                    elif not csv_row[column_name]:
-                        # Skip if the key is empty
-                        continue
-                    elif key_index in keyless_values:
-                        # We now have a key/value pair
-                        extra_attributes[csv_row[column_name]] = keyless_values.pop(key_index)
-                    else:
-                        # Save and continue processing columns
-                        key_name = csv_row[column_name]
-                        valueless_keys[key_index] = key_name
-                elif value_regex_match:
-                    value_index = value_regex_match.group(1)
-                    if not value_index:
-                        # Invalid (ie blank) auto index
-                        raise Exception("Auto indexes must be non-empty")
-                    elif not csv_row[column_name] and omit_if_empty_value:
-                        # Optionally skip if empty value
-                        continue
-                    elif value_index in valueless_keys:
-                        # We now have a key/value pair
-                        key_name = valueless_keys.pop(value_index)
-                        extra_attributes[key_name] = csv_row[column_name]
-                    else:
-                        # Save and continue processing columns
-                        value = csv_row[column_name]
-                        keyless_values[value_index] = value
+                value_index = name_or_index
+                if not value_index:
+                    # Invalid (ie blank) auto index
+                    raise Exception("Auto indexes must be non-empty")
+                elif not csv_row[column_name] and omit_if_empty_value:
+                    # Optionally skip if empty value
+                    continue
+                elif value_index in valueless_keys:
+                    # We now have a key/value pair
+                    key_name = valueless_keys.pop(value_index)
+                    extra_attributes[key_name] = csv_row[column_name]
+                else:
+                    # Save and continue processing columns
+                    value = csv_row[column_name]
+                    keyless_values[value_index] = value
 
         # TODO: Handle orphaned keys and values
 
@@ -512,14 +800,14 @@ class OclCsvToJsonConverter(object):
 
         # Add auto sub resources
         if 'auto_sub_resources' in auto_sub_resources_def:
-            unique_auto_resource_indexes = OclCsvToJsonConverter.get_unique_csv_row_auto_indexes(
+            unique_auto_resource_indexes = self.get_cached_csv_row_auto_indexes(
                 index_prefix=auto_sub_resources_def[self.DEF_KEY_AUTO_INDEX_PREFIX],
                 index_postfix=auto_sub_resources_def[self.DEF_KEY_AUTO_INDEX_POSTFIX],
                 index_regex=auto_sub_resources_def[self.DEF_KEY_AUTO_INDEX_REGEX],
                 resource_def_template=auto_sub_resources_def['auto_sub_resources'],
                 csv_row=csv_row)
             for auto_resource_index in unique_auto_resource_indexes:
-                sub_resource_def = OclCsvToJsonConverter.generate_resource_def_from_template(
+                sub_resource_def = self.get_cached_resource_def_from_template(
                     index_prefix=auto_sub_resources_def[self.DEF_KEY_AUTO_INDEX_PREFIX],
                     index_postfix=auto_sub_resources_def[self.DEF_KEY_AUTO_INDEX_POSTFIX],
                     auto_resource_index=auto_resource_index,
@@ -561,6 +849,23 @@ class OclCsvToJsonConverter(object):
             owner_id=to_concept_owner_id, repository_id=to_concept_source,
             owner_type=to_concept_owner_type, include_trailing_slash=True)
 
+    def get_cached_resource_def_from_template(self, index_prefix, index_postfix,
+                                              auto_resource_index, resource_def_template):
+        """
+        Same as generate_resource_def_from_template, but the generated definition is cached and
+        shared by all rows with the same auto index. Generated definitions must not be modified.
+        """
+        cache_key = (id(resource_def_template), index_prefix, index_postfix, auto_resource_index)
+        cached_template, resource_def = self._resource_def_cache.get(cache_key, (None, None))
+        if cached_template is not resource_def_template:
+            resource_def = OclCsvToJsonConverter.generate_resource_def_from_template(
+                index_prefix=index_prefix, index_postfix=index_postfix,
+                auto_resource_index=auto_resource_index,
+                resource_def_template=resource_def_template)
+            # Keep a reference to the template so that its id cannot be reused while cached
+            self._resource_def_cache[cache_key] = (resource_def_template, resource_def)
+        return resource_def
+
     @staticmethod
     def generate_resource_def_from_template(index_prefix, index_postfix, auto_resource_index,
                                             resource_def_template):
@@ -589,16 +894,20 @@ class OclCsvToJsonConverter(object):
         elif isinstance(resource_def_template, list):
             new_field_defs = []
             for current_field_def in resource_def_template:
-                new_field_def = current_field_def.copy()
+                # Field definitions without a column prefix are shared with the template
+                new_field_def = current_field_def
                 if 'column_prefix' in new_field_def:
+                    new_field_def = current_field_def.copy()
                     column_prefix = new_field_def.pop('column_prefix')
                     new_column_name = '%s%s%s%s' % (
                         column_prefix, index_prefix, auto_resource_index, index_postfix)
                     if 'column' in new_field_def and new_field_def['column']:
-                        if not isinstance(new_field_def['column'], list):
-                            new_field_def['column'] = [new_field_def['column']]
-                        # Add new column to beginning of list so that it is searched first
-                        new_field_def['column'].insert(0, new_column_name)
+                        columns = new_field_def['column']
+                        if not isinstance(columns, list):
+                            columns = [columns]
+                        # Add new column to beginning of a new list so that it is searched first,
+                        # without modifying the column list of the template
+                        new_field_def['column'] = [new_column_name] + columns
                     else:
                         new_field_def['column'] = new_column_name
                 new_field_defs.append(new_field_def)
@@ -608,6 +917,23 @@ class OclCsvToJsonConverter(object):
                        'Expected <list> or <dict>.') % str(type(resource_def_template))
             raise Exception(err_msg)
 
+    def get_cached_csv_row_auto_indexes(self, index_prefix, index_postfix, index_regex,
+                                        resource_def_template, csv_row):
+        """
+        Same as get_unique_csv_row_auto_indexes, but cached per template and CSV header, since the
+        auto indexes only depend on the column names and not on the values of the row
+        """
+        cache_key = (id(resource_def_template), index_prefix, index_postfix, index_regex,
+                     tuple(csv_row))
+        cached_template, auto_indexes = self._auto_indexes_cache.get(cache_key, (None, None))
+        if cached_template is not resource_def_template:
+            auto_indexes = OclCsvToJsonConverter.get_unique_csv_row_auto_indexes(
+                index_prefix=index_prefix, index_postfix=index_postfix, index_regex=index_regex,
+                resource_def_template=resource_def_template, csv_row=csv_row)
+            # Keep a reference to the template so that its id cannot be reused while cached
+            self._auto_indexes_cache[cache_key] = (resource_def_template, auto_indexes)
+        return auto_indexes
+
     @staticmethod
     def get_unique_csv_row_auto_indexes(index_prefix, index_postfix, index_regex,
                                         resource_def_template, csv_row):
@@ -616,37 +942,47 @@ class OclCsvToJsonConverter(object):
         Note that resource_def_template may be either a full resource_def (dict) or a
         sub_resource_def (list).
         """
-        unique_auto_resource_indexes = []
+        auto_indexes = []
+        OclCsvToJsonConverter._collect_csv_row_auto_indexes(
+            index_prefix=index_prefix, index_postfix=index_postfix, index_regex=index_regex,
+            resource_def_template=resource_def_template, csv_row=csv_row,
+            auto_indexes=auto_indexes)
+        # Dedup the list so that each auto-index only appears once, at its last position
+        return list(dict.fromkeys(reversed(auto_indexes)))[::-1]
+
+    @staticmethod
+    def _collect_csv_row_auto_indexes(index_prefix, index_postfix, index_regex,
+                                      resource_def_template, csv_row, auto_indexes):
+        """
+        Append the auto indexes of each field definition list in resource_def_template to
+        auto_indexes, in the order of the columns and without duplicates per list
+        """
         if isinstance(resource_def_template, dict):
             for resource_field_type in OclCsvToJsonConverter.DEF_RESOURCE_FIELD_TYPES:
                 if resource_field_type in resource_def_template:
-                    unique_auto_resource_indexes += OclCsvToJsonConverter.get_unique_csv_row_auto_indexes(
+                    OclCsvToJsonConverter._collect_csv_row_auto_indexes(
                         index_prefix=index_prefix, index_postfix=index_postfix,
                         index_regex=index_regex,
                         resource_def_template=resource_def_template[resource_field_type],
-                        csv_row=csv_row)
-            # Dedup the list so that each auto-index only appears once
-            unique_auto_resource_indexes = [i for n, i in enumerate(
-                unique_auto_resource_indexes) if i not in unique_auto_resource_indexes[n + 1:]]
+                        csv_row=csv_row, auto_indexes=auto_indexes)
         elif isinstance(resource_def_template, list):
+            column_regexes = [
+                (field_def['column_prefix'], _compile_auto_index_regex(
+                    field_def['column_prefix'], index_prefix, index_regex, index_postfix))
+                for field_def in resource_def_template if 'column_prefix' in field_def]
+            list_auto_indexes = {}  # Used as an ordered set
             for column_name in csv_row:
-                for field_def in resource_def_template:
-                    if 'column_prefix' not in field_def:
+                for column_prefix, column_regex in column_regexes:
+                    if not column_name.startswith(column_prefix):
                         continue
-                    if column_name[:len(field_def['column_prefix'])] == field_def['column_prefix']:
-                        search_exp = r'^%s%s(%s)%s$' % (
-                            field_def['column_prefix'], re.escape(index_prefix),
-                            index_regex, re.escape(index_postfix))
-                        regex_match = re.search(search_exp, column_name)
-                        if regex_match:
-                            index = regex_match.group(1)
-                            if index and index not in unique_auto_resource_indexes:
-                                unique_auto_resource_indexes.append(index)
+                    regex_match = column_regex.match(column_name)
+                    if regex_match and regex_match.group(1):
+                        list_auto_indexes[regex_match.group(1)] = None
+            auto_indexes.extend(list_auto_indexes)
         else:
             err_msg = ('Invalid type "%s" for resource_def_template. '
                        'Expected <list> or <dict>.') % str(type(resource_def_template))
             raise Exception(err_msg)
-        return unique_auto_resource_indexes
 
     def process_resource_def(self, csv_row, resource_def):
         """
@@ -654,10 +990,12 @@ class OclCsvToJsonConverter(object):
         list of field definitions.
         """
         new_resource = {}
+        process_field_def = self.process_field_def
+        resource_field_key = self.DEF_KEY_RESOURCE_FIELD
         for field_def in resource_def:
-            value = self.process_field_def(csv_row, field_def)
+            value = process_field_def(csv_row, field_def)
             if value is not None:
-                new_resource[field_def[self.DEF_KEY_RESOURCE_FIELD]] = value
+                new_resource[field_def[resource_field_key]] = value
         return new_resource
 
     def process_field_def(self, csv_row, field_def):
@@ -674,29 +1012,28 @@ class OclCsvToJsonConverter(object):
         field_def must include 'resource_type' and either a 'column' or 'value' key or
         both a 'csv_to_json_processor' and 'data_column' keys. If 'column' is a list, then
         the first non-empty column in the list that is present in the CSV row is used.
-        Set 'skip_empty_value' to False to not skip non-empty values.
+        Set 'skip_empty_value' to False to not skip empty values.
         Optional keys include 'required', 'default', and 'datatype'
         """
         if 'column' in field_def:
             columns = field_def['column']
-            if not isinstance(field_def['column'], list):
+            if not isinstance(columns, list):
                 columns = [columns]
-            skip_empty_value = True
-
-            if 'skip_empty_value' in field_def:
-                skip_empty_value = bool(skip_empty_value)
+            skip_empty_value = bool(field_def.get('skip_empty_value', True))
             for column in columns:
-                if column in csv_row and (
-                        skip_empty_value and csv_row[column] or not skip_empty_value):
+                value = csv_row.get(column, _MISSING)
+                if value is _MISSING:
+                    continue
+                if value or not skip_empty_value:
                     if 'datatype' in field_def:
-                        return self.do_datatype_conversion(csv_row[column], field_def['datatype'])
-                    return csv_row[column]
+                        return self.do_datatype_conversion(value, field_def['datatype'])
+                    return value
 
             # No value found from 'column', so apply default/required
             if 'default' in field_def:
                 # Return 'default' if 'column' is not in CSV row
                 return field_def['default']
-            elif 'required' in field_def and field_def['required']:
+            elif field_def.get('required'):
                 err_msg = 'Missing required column %s in CSV row: %s' % (
                     field_def['column'], csv_row)
                 raise Exception(err_msg)
@@ -720,29 +1057,20 @@ class OclCsvToJsonConverter(object):
         Convert the value to the specified datatype, where datatype is a string of the name of the
         desired datatype (e.g. datatype="bool", "int", "float").
         """
-        if datatype == 'bool':
-            return bool(util.strtobool(str(value)))
-        elif datatype == 'int':
-            return int(value)
-        elif datatype == 'float':
-            return float(value)
-        elif datatype == 'list':
-            return [v.strip() for v in value.strip('][').split(',')]
-        elif datatype == 'json':
-            try:
-                return json.loads(value)
-            except:
-                return value
+        convert = _DATATYPE_CONVERTERS.get(datatype)
+        if convert:
+            return convert(value)
         return value
 
     def process_auto_concept_reference(self, csv_row, field_def):
         """ Returns a concept reference expression, e.g. {'expressions': [<concept_url>]} """
         # TODO: the concept url variables are not stored in the field_def or csv_row, they're evaluated
+        # Note that field_def must not be modified, as it is shared by all rows
         concept_url = OclCsvToJsonConverter.get_concept_url(
-            owner_id=field_def.pop('ref_target_owner'),
-            owner_type=field_def.pop('ref_target_owner_type'),
-            source=field_def.pop('ref_target_source'),
-            concept_id=field_def.pop('ref_target_concept_id'))
+            owner_id=field_def.get('ref_target_owner', ''),
+            owner_type=field_def.get('ref_target_owner_type', ''),
+            source=field_def.get('ref_target_source', ''),
+            concept_id=field_def.get('ref_target_concept_id', ''))
         if concept_url:
             return {'expressions': [concept_url]}
         return None
@@ -763,16 +1091,13 @@ class OclCsvToJsonConverter(object):
         if self.allow_special_characters:
             return unformatted_id
 
-        formatted_id = list(unformatted_id)
         if allow_underscore:
             # Remove underscore from the invalid characters - Concept IDs are okay with underscores
             chars_to_remove = self.INVALID_CHARS.replace('_', '')
         else:
             chars_to_remove = self.INVALID_CHARS
-        for index in range(len(unformatted_id)):
-            if unformatted_id[index] in chars_to_remove:
-                formatted_id[index] = self.REPLACE_CHAR
-        return ''.join(formatted_id)
+        return unformatted_id.translate(
+            _get_identifier_translation_table(chars_to_remove, self.REPLACE_CHAR))
 
     @staticmethod
     def get_concept_url(concept_url='', owner_id='', owner_type='', source='', concept_id=''):
@@ -1315,12 +1640,20 @@ class OclStandardCsvToJsonConverter(OclCsvToJsonConverter):
         },
     ]
 
-    def __init__(self, csv_filename='', input_list=None, verbose=False, allow_special_characters=False):
+    def __init__(self, csv_filename='', input_list=None, verbose=False, allow_special_characters=False,
+                 input_iter=None):
         """ Initialize the object with the standard CSV resource definition """
         OclCsvToJsonConverter.__init__(
             self, csv_filename=csv_filename,
             input_list=input_list,
             csv_resource_definitions=self.default_csv_resource_definitions,
             verbose=verbose,
-            allow_special_characters=allow_special_characters
+            allow_special_characters=allow_special_characters,
+            input_iter=input_iter
         )
+
+
+def _process_csv_rows(converter, csv_rows, attr=None):
+    """ Module level so it can be pickled for the process_by_row_parallel worker processes """
+    converter.input_list = csv_rows
+    return converter.process_by_row(attr=attr)
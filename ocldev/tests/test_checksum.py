@@ -0,0 +1,94 @@
+import unittest
+import uuid
+
+from ocldev.checksum import Checksum
+
+
+CONCEPT = {
+    'concept_class': 'Diagnosis',
+    'datatype': 'N/A',
+    'retired': False,
+    'external_id': '1234AAAA',
+    'extras': {'foo': 'bar', '__private': 'x'},
+    'names': [
+        {'locale': 'en', 'locale_preferred': True, 'name': 'Malaria', 'name_type': 'FULLY_SPECIFIED'},
+        {'locale': 'fr', 'locale_preferred': False, 'name': 'Paludisme', 'name_type': 'SHORT'},
+    ],
+    'descriptions': [{'locale': 'en', 'description': 'A disease', 'description_type': None}],
+    'parent_concept_urls': ['/orgs/CIEL/sources/CIEL/concepts/1/'],
+}
+MAPPING = {
+    'map_type': 'SAME-AS',
+    'from_concept_url': '/orgs/CIEL/sources/CIEL/concepts/1234/',
+    'to_concept_url': '/orgs/WHO/sources/ICD-10/2010/concepts/A00%2E1/',
+    'sort_weight': 1.0,
+    'extras': {'__flag': True},
+    'retired': False,
+}
+ORGANIZATION = {'name': 'CIEL', 'company': None, 'website': 'https://ciel.org', 'is_active': True}
+
+
+class UpperChecksum(Checksum):
+    """ Module level so it can be pickled for the generate_batch worker processes """
+
+    def generate(self):
+        return super().generate().upper()
+
+
+class ChecksumTest(unittest.TestCase):
+    """ Checksums must stay byte-compatible with the ones generated by the OCL API """
+
+    def test_concept_checksums(self):
+        self.assertEqual(Checksum('concept', CONCEPT).generate(), '464bda7de1a2fec7027eaed6ee8f1065')
+        self.assertEqual(Checksum('concept', CONCEPT, 'smart').generate(), 'e200b92bd2ff4d1ec21c0e83b5f4fa4e')
+
+    def test_mapping_checksums(self):
+        self.assertEqual(Checksum('mapping', MAPPING).generate(), 'd833eb90bb2794922af96cfafe2a9814')
+        self.assertEqual(Checksum('mapping', MAPPING, 'smart').generate(), '065e578471df5af7f383f19e3a9a48df')
+
+    def test_organization_checksums(self):
+        self.assertEqual(Checksum('org', ORGANIZATION).generate(), '6b2c945689c1f8297fff86904b16e48d')
+        self.assertEqual(Checksum('org', ORGANIZATION, 'smart').generate(), '6b2c945689c1f8297fff86904b16e48d')
+
+    def test_multiple_resources_checksum(self):
+        data = [CONCEPT, dict(CONCEPT, retired=True)]
+        self.assertEqual(Checksum('concept', data).generate(), 'fc1aa30a1505ddfd9a005f7b4cc29174')
+        self.assertEqual(
+            Checksum('conceptname', CONCEPT['names'][0]).generate(), 'd4f3417d8223aa0b1c8e991d90c30bfe')
+
+    def test_integral_floats_are_normalized(self):
+        self.assertEqual(Checksum(None, {'a': 1.0}).generate(), Checksum(None, {'a': 1}).generate())
+        self.assertNotEqual(Checksum(None, {'a': 1.5}).generate(), Checksum(None, {'a': 1}).generate())
+        self.assertNotEqual(Checksum(None, {'a': True}).generate(), Checksum(None, {'a': 1}).generate())
+
+    def test_generate_batch(self):
+        data = [CONCEPT, dict(CONCEPT, retired=True), CONCEPT]
+        expected = [Checksum('concept', _data).generate() for _data in data]
+        self.assertEqual(Checksum.generate_batch('concept', data, max_workers=1), expected)
+        self.assertEqual(Checksum.generate_batch('concept', data, max_workers=2, chunksize=1), expected)
+        with self.assertRaises(ValueError):
+            Checksum.generate_batch('foo', data)
+
+    def test_generate_batch_subclass(self):
+        data = [CONCEPT, dict(CONCEPT, retired=True)]
+        expected = [UpperChecksum('concept', _data).generate() for _data in data]
+        self.assertEqual(UpperChecksum.generate_batch('concept', data, max_workers=1), expected)
+        self.assertEqual(UpperChecksum.generate_batch('concept', data, max_workers=2, chunksize=1), expected)
+
+    def test_serialize(self):
+        self.assertEqual(
+            Checksum('concept', CONCEPT)._serialize({'b': [2, 1], 'a': uuid.UUID(int=1), 'c': ['x']}),
+            '{["a", "b", "c"]"00000000-0000-0000-0000-000000000001",[1,2],"x",}'
+        )
+
+    def test_serialize_in_chunks(self):
+        checksum = Checksum('concept', CONCEPT)
+        fields = checksum.get_concept_fields(CONCEPT)
+        self.assertEqual(''.join(checksum._iter_serialized(fields, chunk_size=1)), checksum._serialize(fields))
+        self.assertEqual(Checksum('concept', CONCEPT, verbosity=1).generate(), '464bda7de1a2fec7027eaed6ee8f1065')
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Checksum('foo', {})
+        with self.assertRaises(ValueError):
+            Checksum('concept', {}, 'foo')
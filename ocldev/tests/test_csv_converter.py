@@ -1,4 +1,10 @@
+import csv
+import io
+import json
+import os
+import tempfile
 import unittest
+import unittest.mock
 
 
 import ocldev.oclcsvtojsonconverter
@@ -94,3 +100,214 @@ class OclStandardCsvToJsonConverterTest(unittest.TestCase):
         }]
         actual_json_output = self.convert_csv_to_json(csv_input)
         self.assertEqual(actual_json_output, expected_json_output)
+
+    def test_load_csv(self):
+        filename = os.path.join(os.path.dirname(__file__), './sample.csv')
+        with open(filename) as csv_file:
+            expected_rows = list(csv.DictReader(csv_file))
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(csv_filename=filename)
+        self.assertEqual([row.copy() for row in csv_converter.input_list], expected_rows)
+        dict_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(input_list=expected_rows)
+        self.assertEqual(csv_converter.process(), dict_converter.process())
+        self.assertEqual(csv_converter.process_by_row(), dict_converter.process_by_row())
+        self.assertEqual(csv_converter.process_by_row(num_rows=2), dict_converter.process_by_row(num_rows=2))
+
+    def test_process_by_row_streams_csv_file(self):
+        filename = os.path.join(os.path.dirname(__file__), './sample.csv')
+        with open(filename) as csv_file:
+            expected_rows = list(csv.DictReader(csv_file))
+        expected = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(
+            input_list=expected_rows).process_by_row()
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(csv_filename=filename)
+        self.assertEqual(csv_converter.process_by_row(), expected)
+        self.assertIsNone(csv_converter._input_list)
+        self.assertEqual(len(csv_converter.input_list), len(expected_rows))
+        dict_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(input_list=expected_rows)
+        self.assertEqual(csv_converter.process_by_definition(), dict_converter.process_by_definition())
+
+    def test_input_iter(self):
+        filename = os.path.join(os.path.dirname(__file__), './sample.csv')
+        with open(filename) as csv_file:
+            expected_rows = list(csv.DictReader(csv_file))
+        dict_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(input_list=expected_rows)
+        read_rows = []
+
+        def iter_rows():
+            for row in expected_rows:
+                read_rows.append(row)
+                yield row
+
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(input_iter=iter_rows())
+        ocl_resources = csv_converter.iter_process_by_row()
+        self.assertEqual(read_rows, [])
+        self.assertEqual(next(ocl_resources), dict_converter.process_by_row()[0])
+        self.assertEqual(len(read_rows), 1)
+        self.assertEqual(list(ocl_resources), dict_converter.process_by_row()[1:])
+        self.assertIsNone(csv_converter._input_list)
+
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(input_iter=iter(expected_rows))
+        self.assertEqual(csv_converter.process_by_definition(), dict_converter.process_by_definition())
+        self.assertEqual(csv_converter.process_by_row(), dict_converter.process_by_row())
+
+    def test_overridden_load_csv(self):
+        class TabConverter(ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter):
+            def load_csv(self, csv_filename):
+                with open(csv_filename) as csv_file:
+                    self.input_list = list(csv.DictReader(csv_file, delimiter='\t'))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'orgs.tsv')
+            with open(filename, 'w') as tsv_file:
+                tsv_file.write('resource_type\tid\tname\nOrganization\tA\tOrg A\n')
+            csv_converter = TabConverter(csv_filename=filename)
+            expected = [{'type': 'Organization', 'id': 'A', 'name': 'Org A', 'public_access': 'View'}]
+            self.assertEqual(csv_converter.process_by_definition(), expected)
+            self.assertEqual(csv_converter.process_by_row(), expected)
+
+    def test_preprocess_csv_row(self):
+        class Converter(ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter):
+            def preprocess_csv_row(self, row, attr=None):
+                row['name'] = row['name'].upper()
+                return row
+
+        csv_input = [{"resource_type": "Organization", "id": "TestOrg", "name": "Test Org"}]
+        self.assertEqual(Converter(input_list=csv_input).process()[0]['name'], 'TEST ORG')
+        self.assertEqual(csv_input[0]['name'], 'Test Org')
+
+    def test_bool_datatype_conversion(self):
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(input_list=[])
+        self.assertIs(csv_converter.do_datatype_conversion('True', 'bool'), True)
+        self.assertIs(csv_converter.do_datatype_conversion('0', 'bool'), False)
+        with self.assertRaises(ValueError):
+            csv_converter.do_datatype_conversion('maybe', 'bool')
+
+    def test_datatype_conversion(self):
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(input_list=[])
+        self.assertEqual(csv_converter.do_datatype_conversion('12', 'int'), 12)
+        self.assertEqual(csv_converter.do_datatype_conversion('2.5', 'float'), 2.5)
+        self.assertEqual(csv_converter.do_datatype_conversion('[a, b]', 'list'), ['a', 'b'])
+        self.assertEqual(csv_converter.do_datatype_conversion('{"k": 1}', 'json'), {'k': 1})
+        self.assertEqual(csv_converter.do_datatype_conversion('{k', 'json'), '{k')
+        self.assertEqual(csv_converter.do_datatype_conversion('12', 'str'), '12')
+
+    def test_auto_resource_template_is_not_modified(self):
+        template = {
+            'definition_name': 'Auto Org', 'resource_type': 'Organization', 'id_column': 'id',
+            'index_prefix': '[', 'index_postfix': ']', 'index_regex': '[0-9]+',
+            'core_fields': [{'resource_field': 'name', 'column_prefix': 'name', 'column': ['default_name']}],
+        }
+        definitions = [{'definition_name': 'Auto Orgs', 'resource_type': 'AUTO-RESOURCE',
+                        'auto_resource_template': template}]
+        csv_input = [
+            {'id': 'A', 'name[1]': 'A1', 'name[2]': '', 'default_name': 'Default'},
+            {'id': 'B', 'name[1]': 'B1', 'name[2]': 'B2', 'default_name': 'Default'},
+        ]
+        csv_converter = ocldev.oclcsvtojsonconverter.OclCsvToJsonConverter(
+            input_list=csv_input, csv_resource_definitions=definitions)
+        self.assertEqual(
+            [resource['name'] for resource in csv_converter.process()], ['A1', 'Default', 'B1', 'B2'])
+        self.assertEqual(template['core_fields'][0]['column'], ['default_name'])
+
+    def test_auto_resource_template_edited_between_runs(self):
+        template = {
+            'definition_name': 'Auto Org', 'resource_type': 'Organization', 'id_column': 'id',
+            'index_prefix': '[', 'index_postfix': ']', 'index_regex': '[0-9]+',
+            'core_fields': [{'resource_field': 'name', 'column_prefix': 'name'}],
+        }
+        definitions = [{'definition_name': 'Auto Orgs', 'resource_type': 'AUTO-RESOURCE',
+                        'auto_resource_template': template}]
+        csv_input = [{'id': 'A', 'name[1]': 'A1', 'location[1]': 'L1', 'title[2]': 'T2'}]
+        csv_converter = ocldev.oclcsvtojsonconverter.OclCsvToJsonConverter(
+            input_list=csv_input, csv_resource_definitions=definitions)
+        self.assertEqual(csv_converter.process(), [{'type': 'Organization', 'id': 'A', 'name': 'A1'}])
+        template['core_fields'].append({'resource_field': 'location', 'column_prefix': 'location'})
+        expected = [{'type': 'Organization', 'id': 'A', 'name': 'A1', 'location': 'L1'}]
+        self.assertEqual(csv_converter.process_by_definition(), expected)
+        self.assertEqual(csv_converter.process_by_row(), expected)
+        template['core_fields'] = [{'resource_field': 'name', 'column_prefix': 'title'}]
+        expected = [{'type': 'Organization', 'id': 'A', 'name': 'T2'}]
+        self.assertEqual(csv_converter.process_by_definition(), expected)
+        self.assertEqual(csv_converter.process_by_row(), expected)
+
+    def test_process_by_row_parallel(self):
+        filename = os.path.join(os.path.dirname(__file__), './sample.csv')
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(csv_filename=filename)
+        expected = csv_converter.process_by_row()
+        self.assertEqual(csv_converter.process_by_row_parallel(max_workers=1), expected)
+        self.assertEqual(csv_converter.process_by_row_parallel(max_workers=2, chunksize=3), expected)
+        expected = csv_converter.process_by_row(num_rows=2)
+        self.assertEqual(csv_converter.process_by_row_parallel(num_rows=2, max_workers=2), expected)
+        csv_converter.input_list = csv_converter.input_list[:3]
+        expected = csv_converter.process_by_row_parallel(max_workers=1)
+        self.assertEqual(csv_converter.process_by_row_parallel(max_workers=2), expected)
+        self.assertEqual(len(csv_converter.input_list), 3)
+
+    def test_skip_empty_value(self):
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(input_list=[])
+        csv_row = {'a': '', 'b': 'B'}
+        self.assertEqual(csv_converter.get_csv_value(csv_row, {'column': ['a', 'b']}), 'B')
+        self.assertEqual(
+            csv_converter.get_csv_value(csv_row, {'column': ['a', 'b'], 'skip_empty_value': False}), '')
+        self.assertEqual(
+            csv_converter.get_csv_value(csv_row, {'column': ['c'], 'default': 'D', 'skip_empty_value': False}), 'D')
+
+    def test_process_by_row_trigger_dispatch(self):
+        definitions = [
+            {'definition_name': 'A', 'resource_type': 'Organization', 'id_column': 'id',
+             '__trigger_column': 'kind', '__trigger_value': 'a'},
+            {'definition_name': 'Any', 'resource_type': 'Source', 'id_column': 'id'},
+            {'definition_name': 'B', 'resource_type': 'Collection', 'id_column': 'id',
+             '__trigger_column': 'group', '__trigger_value': 'b'},
+            {'definition_name': 'Inactive', 'resource_type': 'User', 'id_column': 'id', 'is_active': False},
+        ]
+        csv_input = [{'id': '1', 'kind': 'a', 'group': 'b'}, {'id': '2', 'kind': 'x'}, {'id': '3', 'group': 'b'}]
+        csv_converter = ocldev.oclcsvtojsonconverter.OclCsvToJsonConverter(
+            input_list=csv_input, csv_resource_definitions=definitions)
+        self.assertEqual(
+            [(resource['type'], resource['id']) for resource in csv_converter.process_by_row()],
+            [('Organization', '1'), ('Source', '1'), ('Collection', '1'), ('Source', '2'),
+             ('Source', '3'), ('Collection', '3')])
+
+    def test_iter_process_by_row(self):
+        filename = os.path.join(os.path.dirname(__file__), './sample.csv')
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(csv_filename=filename)
+        expected = csv_converter.process_by_row()
+        self.assertEqual(list(csv_converter.iter_process_by_row()), expected)
+        self.assertEqual(list(csv_converter.iter_process_by_row(num_rows=2)), csv_converter.process_by_row(num_rows=2))
+
+    def test_write_jsonl(self):
+        filename = os.path.join(os.path.dirname(__file__), './sample.csv')
+        csv_converter = ocldev.oclcsvtojsonconverter.OclStandardCsvToJsonConverter(csv_filename=filename)
+        expected = csv_converter.process_by_row()
+        output_file = io.StringIO()
+        self.assertEqual(csv_converter.write_jsonl(output_file), len(expected))
+        self.assertEqual([json.loads(line) for line in output_file.getvalue().splitlines()], expected)
+        output_file = io.StringIO()
+        csv_converter.write_jsonl(output_file, use_orjson=True)
+        self.assertEqual([json.loads(line) for line in output_file.getvalue().splitlines()], expected)
+
+    def test_to_json_line(self):
+        to_json_line = ocldev.oclcsvtojsonconverter._to_json_line
+        value = {'name': 'Paludisme \u00e9', 'n': [1, 2], 'weight': 2.5, 'retired': None}
+        expected = '{"name":"Paludisme \u00e9","n":[1,2],"weight":2.5,"retired":null}\n'
+        self.assertEqual(to_json_line(value), expected)
+        self.assertEqual(to_json_line(value, use_orjson=True), expected)
+        self.assertEqual(to_json_line({'a': 2 ** 70}), '{"a":1180591620717411303424}\n')
+        self.assertEqual(to_json_line({'a': 2 ** 70}, use_orjson=True), '{"a":1180591620717411303424}\n')
+        with unittest.mock.patch.object(ocldev.oclcsvtojsonconverter, 'orjson', None):
+            self.assertEqual(to_json_line(value, use_orjson=True), expected)
+
+    def test_process_by_row_overridden_trigger(self):
+        class CaseInsensitiveConverter(ocldev.oclcsvtojsonconverter.OclCsvToJsonConverter):
+            def process_csv_row_with_definition(self, csv_row, csv_resource_def, attr=None):
+                csv_row = dict(csv_row, kind=csv_row.get('kind', '').lower())
+                return super(CaseInsensitiveConverter, self).process_csv_row_with_definition(
+                    csv_row, csv_resource_def, attr=attr)
+
+        definitions = [{'definition_name': 'Org', 'resource_type': 'Organization', 'id_column': 'id',
+                        '__trigger_column': 'kind', '__trigger_value': 'org'}]
+        csv_converter = CaseInsensitiveConverter(
+            input_list=[{'id': 'A', 'kind': 'ORG'}], csv_resource_definitions=definitions)
+        expected = [{'type': 'Organization', 'id': 'A'}]
+        self.assertEqual(csv_converter.process_by_definition(), expected)
+        self.assertEqual(csv_converter.process_by_row(), expected)